@@ -1,10 +1,16 @@
+import io
 import json
 import uuid
-from typing import Any, Dict, BinaryIO
+from typing import Any, Dict, BinaryIO, Optional
 
+import numpy as np
 from azure.storage.blob import BlobServiceClient, ContentSettings
 
+from app.blob_cache import BlobCache, estimate_nbytes
 from app.config import settings
+from app.lazy_resource import LazyResource
+from app.search.scene_snapshot import decode_scene_snapshot, scene_snapshot_nbytes
+from app.transcript_format import binary_transcript_nbytes, decode_binary_transcript
 
 from datetime import datetime, timedelta, timezone
 from azure.storage.blob import (
@@ -60,10 +66,17 @@ def create_upload_sas_url(
         "content_type": content_type or "application/octet-stream",
     }
 
-def get_blob_service_client():
-    return BlobServiceClient.from_connection_string(
+# Shared client so every request reuses the same HTTP connection pool.
+_blob_service_client = LazyResource(
+    "azure_blob_client",
+    lambda: BlobServiceClient.from_connection_string(
         settings.AZURE_STORAGE_CONNECTION_STRING
-    )
+    ),
+)
+
+
+def get_blob_service_client():
+    return _blob_service_client.get()
 
 
 def sanitize_filename(filename: str) -> str:
@@ -146,21 +159,163 @@ def delete_media_blob_from_azure(blob_name: str) -> bool:
         print(f"[Azure cleanup] Could not delete blob {blob_name}: {error}")
         return False
 
+_transcript_cache = BlobCache(
+    max_bytes=settings.TRANSCRIPT_CACHE_MAX_BYTES,
+    revalidate_seconds=settings.TRANSCRIPT_CACHE_REVALIDATE_SECONDS,
+)
+
+
+def get_transcript_blob_client(blob_name: str):
+    return get_blob_service_client().get_blob_client(
+        container=settings.AZURE_TRANSCRIPTS_CONTAINER,
+        blob=blob_name,
+    )
+
+
+def parse_json_blob(data: bytes) -> Any:
+    return json.loads(data.decode("utf-8"))
+
+
 def load_transcript_json(blob_name: str) -> Dict[str, Any]:
     """
-    Downloads transcript JSON from Azure Blob and returns it as a Python dict.
+    Returns the transcript JSON stored in Azure Blob as a Python dict.
+
+    Served from the in-process transcript cache; Azure is only asked
+    "has this changed?" (ETag) once the cached copy is older than
+    TRANSCRIPT_CACHE_REVALIDATE_SECONDS.
     """
 
-    blob_service_client = BlobServiceClient.from_connection_string(
-        settings.AZURE_STORAGE_CONNECTION_STRING
+    transcript_data = _transcript_cache.get(
+        get_transcript_blob_client(blob_name),
+        parse=parse_json_blob,
+        measure=estimate_nbytes,
+    )
+
+    if transcript_data is None:
+        raise FileNotFoundError(f"Transcript blob not found: {blob_name}")
+
+    return transcript_data
+
+
+def load_transcript_entry(blob_name: str) -> Dict[str, Any]:
+    """
+    Returns the cache entry of the transcript for blob_name (the JSON
+    transcript blob name stored on the job).
+
+    The binary transcript next to it is preferred: it is smaller to download
+    and is decoded without building a dict per segment. Jobs processed before
+    it existed fall back to the JSON transcript.
+    """
+
+    binary_entry = _transcript_cache.get_entry(
+        get_transcript_blob_client(
+            get_transcript_sidecar_blob_name(blob_name, ".transcript.bin")
+        ),
+        parse=decode_binary_transcript,
+        measure=binary_transcript_nbytes,
+    )
+
+    if binary_entry["value"] is not None:
+        return binary_entry
+
+    json_entry = _transcript_cache.get_entry(
+        get_transcript_blob_client(blob_name),
+        parse=parse_json_blob,
+        measure=estimate_nbytes,
+    )
+
+    if json_entry["value"] is None:
+        raise FileNotFoundError(f"Transcript blob not found: {blob_name}")
+
+    return json_entry
+
+
+def load_transcript(blob_name: str) -> Dict[str, Any]:
+    """
+    Returns the transcript for a job, binary or JSON, in the JSON shape.
+    """
+
+    return load_transcript_entry(blob_name)["value"]
+
+
+def get_transcript_search_state(blob_name: str) -> Dict[str, Any]:
+    """
+    Returns a dict tied to the cached transcript entry, where search code can
+    keep structures derived from it. The dict is dropped together with the
+    entry on eviction or when the transcript blob changes.
+    """
+
+    return load_transcript_entry(blob_name)["derived"]
+
+
+def get_transcript_sidecar_blob_name(transcript_blob_name: str, suffix: str) -> str:
+    """
+    The audio worker stores extra files next to the transcript:
+    <job_id>.json -> <job_id>.transcript.bin, <job_id>.index.json,
+    <job_id>.embeddings.npy
+    """
+
+    stem = transcript_blob_name
+
+    if stem.endswith(".json"):
+        stem = stem[: -len(".json")]
+
+    return f"{stem}{suffix}"
+
+
+def get_transcript_index_blob_name(transcript_blob_name: str) -> str:
+    return get_transcript_sidecar_blob_name(transcript_blob_name, ".index.json")
+
+
+def load_transcript_index(transcript_blob_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the dialogue index stored next to a transcript.
+    Returns None for jobs processed before the index existed.
+    """
+
+    return _transcript_cache.get(
+        get_transcript_blob_client(
+            get_transcript_index_blob_name(transcript_blob_name)
+        ),
+        parse=parse_json_blob,
+        measure=estimate_nbytes,
     )
 
-    container_client = blob_service_client.get_container_client(
-        settings.AZURE_TRANSCRIPTS_CONTAINER
+
+def parse_npy_blob(data: bytes) -> np.ndarray:
+    # Stored as float16 to halve the blob; scored as float32.
+    return np.load(io.BytesIO(data), allow_pickle=False).astype("float32")
+
+
+def load_transcript_embeddings(transcript_blob_name: str) -> Optional[np.ndarray]:
+    """
+    Returns the segment embedding matrix stored next to a transcript, one
+    L2-normalized CLIP text vector per segment.
+    Returns None for jobs processed before semantic search existed.
+    """
+
+    return _transcript_cache.get(
+        get_transcript_blob_client(
+            get_transcript_sidecar_blob_name(transcript_blob_name, ".embeddings.npy")
+        ),
+        parse=parse_npy_blob,
+        measure=lambda matrix: matrix.nbytes,
     )
 
-    blob_client = container_client.get_blob_client(blob_name)
 
-    data = blob_client.download_blob().readall()
+def load_scene_snapshot(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the scene vector snapshot the video worker stores as
+    <job_id>.scenes.npz. Returns None for jobs indexed before snapshots
+    existed.
+    """
+
+    return _transcript_cache.get(
+        get_transcript_blob_client(f"{job_id}.scenes.npz"),
+        parse=decode_scene_snapshot,
+        measure=scene_snapshot_nbytes,
+    )
+
 
-    return json.loads(data.decode("utf-8"))
\ No newline at end of file
+def get_transcript_cache_stats() -> Dict[str, Any]:
+    return _transcript_cache.stats()
@@ -0,0 +1,265 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError, ResourceNotModifiedError
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Approximate in-memory size of a parsed value: numpy buffers plus the
+    Python containers, strings and numbers reachable from it. Shared
+    objects are counted once.
+    """
+
+    total = 0
+    seen = set()
+    stack = [value]
+
+    while stack:
+        item = stack.pop()
+
+        if id(item) in seen:
+            continue
+
+        seen.add(id(item))
+
+        if isinstance(item, np.ndarray):
+            total += item.nbytes
+            continue
+
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+
+    return total
+
+
+class DerivedState(dict):
+    """
+    The "derived" dict of a cache entry. Every structure stored in it is
+    measured and added to the entry's size, so search structures built
+    from a blob count toward max_bytes like the blob itself.
+    """
+
+    def __init__(self, on_add: Callable[[int], None]):
+        super().__init__()
+        self._on_add = on_add
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._on_add(estimate_nbytes(value))
+
+
+class BlobCache:
+    """
+    Size-bounded LRU cache of parsed Azure blobs.
+
+    Entries are keyed by container/blob name and hold the parsed value, the
+    blob ETag and a free-form "derived" dict for search structures built
+    from the value. Within revalidate_seconds an entry is served without
+    touching Azure; after that a conditional (If-None-Match) download either
+    confirms the entry or replaces it. Eviction is by total entry size: the
+    downloaded bytes, or what measure() reports for the parsed value when a
+    parser expands the data (decompression, float16 -> float32), plus the
+    structures later stored in "derived".
+
+    Loading is single-flight per blob: concurrent misses on one blob wait
+    for a single download instead of each fetching and parsing it, and get
+    its result even when it is too large to cache.
+
+    Missing blobs are cached as None so old jobs without an optional blob
+    do not pay a 404 round trip on every request.
+    """
+
+    def __init__(self, max_bytes: int, revalidate_seconds: float):
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # Blob key -> {"done": Event, "entry": the fetched entry or None}.
+        self._loading: Dict[str, Dict[str, Any]] = {}
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(
+        self,
+        blob_client,
+        parse: Callable[[bytes], Any],
+        measure: Optional[Callable[[Any], int]] = None,
+    ) -> Any:
+        return self.get_entry(blob_client, parse, measure)["value"]
+
+    def get_entry(
+        self,
+        blob_client,
+        parse: Callable[[bytes], Any],
+        measure: Optional[Callable[[Any], int]] = None,
+    ) -> Dict[str, Any]:
+        key = f"{blob_client.container_name}/{blob_client.blob_name}"
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+
+                if entry is not None:
+                    self._entries.move_to_end(key)
+
+                    if time.monotonic() - entry["checked_at"] < self.revalidate_seconds:
+                        self.hits += 1
+                        return entry
+
+                loading = self._loading.get(key)
+
+                if loading is None:
+                    loading = {"done": threading.Event(), "entry": None}
+                    self._loading[key] = loading
+                    break
+
+            # Another thread is fetching this blob; use its result. If that
+            # fetch failed, try again, possibly as the next loader.
+            loading["done"].wait()
+
+            if loading["entry"] is not None:
+                with self._lock:
+                    self.hits += 1
+
+                return loading["entry"]
+
+        try:
+            loading["entry"] = self._fetch(key, blob_client, entry, parse, measure)
+            return loading["entry"]
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+            loading["done"].set()
+
+    def _fetch(
+        self,
+        key: str,
+        blob_client,
+        entry: Optional[Dict[str, Any]],
+        parse: Callable[[bytes], Any],
+        measure: Optional[Callable[[Any], int]],
+    ) -> Dict[str, Any]:
+        # Network I/O happens outside the lock so one slow download does not
+        # block cache hits for other blobs.
+        etag = entry["etag"] if entry is not None else None
+
+        try:
+            if etag:
+                downloader = blob_client.download_blob(
+                    etag=etag,
+                    match_condition=MatchConditions.IfModified,
+                )
+            else:
+                downloader = blob_client.download_blob()
+
+            data = downloader.readall()
+            new_etag = downloader.properties.etag
+
+        except ResourceNotFoundError:
+            data = None
+            new_etag = None
+
+        except ResourceNotModifiedError:
+            # 304 to the If-None-Match download: the cached entry is current.
+            if entry is None:
+                raise
+
+            with self._lock:
+                entry["checked_at"] = time.monotonic()
+                self.revalidated += 1
+
+                if key not in self._entries:
+                    self._store(key, entry)
+
+            return entry
+
+        value = parse(data) if data is not None else None
+        size = 0
+
+        if data is not None:
+            size = max(len(data), measure(value) if measure else 0)
+
+        new_entry = {
+            "value": value,
+            "etag": new_etag,
+            "size": size,
+            "checked_at": time.monotonic(),
+        }
+        new_entry["derived"] = DerivedState(
+            lambda nbytes: self._grow(key, new_entry, nbytes)
+        )
+
+        with self._lock:
+            self.misses += 1
+            self._store(key, new_entry)
+
+        return new_entry
+
+    def _grow(self, key: str, entry: Dict[str, Any], nbytes: int) -> None:
+        with self._lock:
+            entry["size"] += nbytes
+
+            if self._entries.get(key) is not entry:
+                return
+
+            self._total_bytes += nbytes
+            self._evict()
+
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        previous = self._entries.pop(key, None)
+
+        if previous is not None:
+            self._total_bytes -= previous["size"]
+
+        if entry["size"] > self.max_bytes:
+            # Too large to keep; serve it once without caching.
+            return
+
+        self._entries[key] = entry
+        self._total_bytes += entry["size"]
+        self._evict()
+
+    def _evict(self) -> None:
+        # Called with self._lock held.
+        while self._total_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted["size"]
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+
+            entry = self._entries.pop(key, None)
+
+            if entry is not None:
+                self._total_bytes -= entry["size"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
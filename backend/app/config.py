@@ -19,8 +19,89 @@ class Settings:
     )
     AZURE_UPLOADS_CONTAINER = os.getenv("AZURE_UPLOADS_CONTAINER", "momentum-uploads")
 
+    TRANSCRIPT_CACHE_MAX_BYTES: int = int(
+        os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+    )
+    TRANSCRIPT_CACHE_REVALIDATE_SECONDS: float = float(
+        os.getenv("TRANSCRIPT_CACHE_REVALIDATE_SECONDS", "30")
+    )
+
+    LIBRARY_SEARCH_MAX_JOBS: int = int(os.getenv("LIBRARY_SEARCH_MAX_JOBS", "500"))
+    LIBRARY_SEARCH_SHARD_SIZE: int = int(os.getenv("LIBRARY_SEARCH_SHARD_SIZE", "25"))
+    LIBRARY_SEARCH_WORKERS: int = int(os.getenv("LIBRARY_SEARCH_WORKERS", "8"))
+    # Merged shard indexes kept in memory for library dialogue search.
+    LIBRARY_SHARD_CACHE_SIZE: int = int(os.getenv("LIBRARY_SHARD_CACHE_SIZE", "40"))
+    LIBRARY_VISUAL_SEARCH_CONCURRENCY: int = int(
+        os.getenv("LIBRARY_VISUAL_SEARCH_CONCURRENCY", "16")
+    )
+
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY", "")
     PINECONE_INDEX_NAME: str = os.getenv("PINECONE_INDEX_NAME", "")
+    # "pinecone", or "local" for per-namespace .npy matrices under
+    # LOCAL_VECTOR_STORE_DIR (offline runs and benchmarks).
+    VECTOR_STORE: str = os.getenv("VECTOR_STORE", "pinecone")
+    LOCAL_VECTOR_STORE_DIR: str = os.getenv("LOCAL_VECTOR_STORE_DIR", "vector-store")
+
+    # Answer visual searches from the job's scene snapshot blob when it
+    # exists, instead of querying the vector store.
+    VISUAL_SNAPSHOT_SEARCH: bool = os.getenv("VISUAL_SNAPSHOT_SEARCH", "true").lower() == "true"
+
+    # Jobs with their details, cached by id. Ready and failed jobs no
+    # longer change; in-flight jobs are only cached briefly.
+    JOB_CACHE_MAX_ENTRIES: int = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "10000"))
+    JOB_CACHE_TERMINAL_TTL_SECONDS: float = float(
+        os.getenv("JOB_CACHE_TERMINAL_TTL_SECONDS", "3600")
+    )
+    JOB_CACHE_ACTIVE_TTL_SECONDS: float = float(os.getenv("JOB_CACHE_ACTIVE_TTL_SECONDS", "1.0"))
+
+    # Job progress streams: how often watched jobs are re-read from
+    # Supabase, and how often an idle stream sends a keep-alive comment.
+    JOB_EVENTS_POLL_SECONDS: float = float(os.getenv("JOB_EVENTS_POLL_SECONDS", "1.0"))
+    JOB_EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("JOB_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    PINECONE_QUERY_CONCURRENCY: int = int(os.getenv("PINECONE_QUERY_CONCURRENCY", "8"))
+    PINECONE_QUERY_TIMEOUT_SECONDS: float = float(
+        os.getenv("PINECONE_QUERY_TIMEOUT_SECONDS", "10")
+    )
+
+    # torch, torch-int8, onnx or onnx-int8; see app/search/clip_text_engine.py.
+    CLIP_TEXT_ENGINE: str = os.getenv("CLIP_TEXT_ENGINE", "torch")
+    CLIP_ONNX_PATH: str = os.getenv("CLIP_ONNX_PATH", "clip-text.onnx")
+    CLIP_ENGINE_PARITY_THRESHOLD: float = float(
+        os.getenv("CLIP_ENGINE_PARITY_THRESHOLD", "0.99")
+    )
+
+    # Also load the CLIP vision model before forking workers, so
+    # query-by-image shares one copy too. Off by default: text-only
+    # deployments never need it.
+    PRELOAD_CLIP_VISION: bool = os.getenv("PRELOAD_CLIP_VISION", "false").lower() == "true"
+
+    # Query-by-image limits: upload size, decoded pixel count, and the side
+    # length images are shrunk to before CLIP preprocessing.
+    IMAGE_QUERY_MAX_BYTES: int = int(os.getenv("IMAGE_QUERY_MAX_BYTES", str(10 * 1024 * 1024)))
+    IMAGE_QUERY_MAX_PIXELS: int = int(os.getenv("IMAGE_QUERY_MAX_PIXELS", str(40_000_000)))
+    IMAGE_QUERY_MAX_SIDE: int = int(os.getenv("IMAGE_QUERY_MAX_SIDE", "448"))
+
+    # Dedicated threads for model inference, and how many inference calls
+    # may be running or queued before requests get 503.
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "2"))
+    INFERENCE_MAX_PENDING: int = int(os.getenv("INFERENCE_MAX_PENDING", "64"))
+
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+    # Optional SQLite file shared by every worker process on the box.
+    QUERY_EMBEDDING_CACHE_PATH: str = os.getenv("QUERY_EMBEDDING_CACHE_PATH", "")
+
+    # Concurrent CLIP text queries wait up to CLIP_BATCH_MAX_WAIT_MS to
+    # share one forward pass of at most CLIP_BATCH_MAX_SIZE queries.
+    CLIP_BATCH_MAX_SIZE: int = int(os.getenv("CLIP_BATCH_MAX_SIZE", "32"))
+    CLIP_BATCH_MAX_WAIT_MS: float = float(os.getenv("CLIP_BATCH_MAX_WAIT_MS", "5"))
+
+    # Sequence queries ("X, then Y"): at most SEQUENCE_MAX_STEPS sub-queries;
+    # jobs without a scene snapshot pool this many matches per sub-query.
+    SEQUENCE_MAX_STEPS: int = int(os.getenv("SEQUENCE_MAX_STEPS", "5"))
+    SEQUENCE_CANDIDATES: int = int(os.getenv("SEQUENCE_CANDIDATES", "100"))
+
+    SEARCH_BATCH_MAX_QUERIES: int = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "20"))
 
 
 settings = Settings()
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from app.config import settings
+
+
+# Model forward passes (CLIP text and image embedding) run here instead of
+# in Starlette's shared threadpool, which is left to Supabase and Azure
+# I/O. A burst of visual searches can then only fill these few threads,
+# while job polls and dialogue searches keep their own.
+#
+# Requests themselves never occupy these threads: they check the query
+# cache and hand their misses to a micro-batcher from the event loop, and
+# only the batcher's coalesced forward pass is run here.
+_inference_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.INFERENCE_WORKERS),
+    thread_name_prefix="inference",
+)
+
+_pending = 0
+_pending_lock = threading.Lock()
+_rejected = 0
+
+
+class InferenceBusyError(RuntimeError):
+    pass
+
+
+def run_forward_pass(func: Callable[..., Any], *args) -> Any:
+    """
+    Runs one batched forward pass on the inference executor and waits for
+    it. Called from a micro-batcher thread, never from the event loop.
+    """
+
+    return _inference_executor.submit(func, *args).result()
+
+
+async def run_batched(batcher: Any, items: List[Any]) -> List[Any]:
+    """
+    Submits items to a micro-batcher and awaits their outputs, in order,
+    without holding a thread while they wait.
+
+    At most INFERENCE_MAX_PENDING calls may be waiting on inference at
+    once; beyond that InferenceBusyError is raised right away, so an
+    overloaded server answers 503 instead of letting queueing delay grow
+    without bound.
+    """
+
+    global _pending, _rejected
+
+    with _pending_lock:
+        if _pending >= settings.INFERENCE_MAX_PENDING:
+            _rejected += 1
+            raise InferenceBusyError("The search server is busy. Try again in a moment.")
+
+        _pending += 1
+
+    try:
+        futures = batcher.submit_many(items)
+
+        return list(await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in futures)
+        ))
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def get_inference_stats() -> Dict[str, Any]:
+    with _pending_lock:
+        return {
+            "workers": _inference_executor._max_workers,
+            "pending": _pending,
+            "max_pending": settings.INFERENCE_MAX_PENDING,
+            "rejected": _rejected,
+        }
@@ -0,0 +1,120 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+TERMINAL_JOB_STATUSES = {"ready", "failed"}
+
+
+def is_terminal_job(job: Dict[str, Any]) -> bool:
+    """
+    The workers mark a failed job's parent row before its child row, so a
+    job only counts as terminal once its details agree.
+    """
+
+    if job.get("status") not in TERMINAL_JOB_STATUSES:
+        return False
+
+    details = job.get("audio_details") or job.get("video_details") or {}
+    child_status = details.get("audio_status") or details.get("visual_status")
+
+    return child_status is None or child_status in TERMINAL_JOB_STATUSES
+
+
+def compute_job_etag(job: Dict[str, Any]) -> str:
+    body = json.dumps(job, sort_keys=True, default=str, separators=(",", ":"))
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+
+
+class JobCache:
+    """
+    Count-bounded LRU cache of jobs with their details, keyed by job id.
+
+    Jobs in a terminal state (ready, failed) no longer change, so they are
+    kept for terminal_ttl_seconds. In-flight jobs are kept only for
+    active_ttl_seconds, enough to absorb bursts of polls for the same job
+    without serving noticeably stale progress. Each entry carries the ETag
+    of the job, so conditional requests are answered without hashing the
+    job again.
+
+    get() returns a copy; callers may modify the job freely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        terminal_ttl_seconds: float,
+        active_ttl_seconds: float,
+    ):
+        self.max_entries = max_entries
+        self.terminal_ttl_seconds = terminal_ttl_seconds
+        self.active_ttl_seconds = active_ttl_seconds
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(job_id)
+
+            if entry is None or entry["expires_at"] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[job_id]
+
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(job_id)
+            self.hits += 1
+
+        return {
+            "job": copy.deepcopy(entry["job"]),
+            "etag": entry["etag"],
+        }
+
+    def put(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        if is_terminal_job(job):
+            ttl_seconds = self.terminal_ttl_seconds
+        else:
+            ttl_seconds = self.active_ttl_seconds
+
+        etag = compute_job_etag(job)
+
+        if self.max_entries > 0 and ttl_seconds > 0:
+            entry = {
+                "job": copy.deepcopy(job),
+                "etag": etag,
+                "expires_at": time.monotonic() + ttl_seconds,
+            }
+
+            with self._lock:
+                self._entries.pop(job["id"], None)
+                self._entries[job["id"]] = entry
+
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return {
+            "job": job,
+            "etag": etag,
+        }
+
+    def invalidate(self, job_id: str) -> None:
+        with self._lock:
+            self._entries.pop(job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
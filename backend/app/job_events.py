@@ -0,0 +1,136 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Set
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.job_cache import TERMINAL_JOB_STATUSES
+from app.job_repository import get_youtube_jobs_with_details
+
+
+# Job progress is written to Supabase by the Modal workers, out of this
+# process, so there are no local writes to hook. Instead one refresh loop
+# per process re-reads every job that has an open progress stream, all in
+# a single batched lookup, and pushes a job to its subscribers only when
+# its row actually changed. Polling cost then grows with the number of
+# watched jobs per tick, not with the number of clients.
+
+
+class JobEventHub:
+    def __init__(
+        self,
+        load_jobs: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+        poll_seconds: float,
+    ):
+        self.load_jobs = load_jobs
+        self.poll_seconds = poll_seconds
+
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+
+        if job_id in self._latest:
+            queue.put_nowait(self._latest[job_id])
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+
+        if subscribers is None:
+            return
+
+        subscribers.discard(queue)
+
+        if not subscribers:
+            del self._subscribers[job_id]
+            self._latest.pop(job_id, None)
+
+    def publish(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+
+        if self._latest.get(job_id) == job:
+            return
+
+        self._latest[job_id] = job
+
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(job)
+
+    async def _refresh_loop(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.poll_seconds)
+
+            job_ids = list(self._subscribers)
+
+            if not job_ids:
+                break
+
+            try:
+                jobs = await run_in_threadpool(self.load_jobs, job_ids)
+            except Exception as error:
+                print(f"[Job Events] Failed to refresh {len(job_ids)} jobs: {error}")
+                continue
+
+            for job_id in job_ids:
+                job = jobs.get(job_id)
+
+                if job is not None:
+                    self.publish(job)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "watched_jobs": len(self._subscribers),
+            "streams": sum(len(subscribers) for subscribers in self._subscribers.values()),
+        }
+
+
+job_event_hub = JobEventHub(
+    load_jobs=get_youtube_jobs_with_details,
+    poll_seconds=settings.JOB_EVENTS_POLL_SECONDS,
+)
+
+
+def format_job_event(job: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(job, default=str, separators=(',', ':'))}\n\n"
+
+
+async def stream_job_events(job: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for one job: its current state first, then every
+    change, ending after a ready or failed state. Idle streams get a
+    comment line every JOB_EVENTS_HEARTBEAT_SECONDS so proxies keep the
+    connection open.
+    """
+
+    job_id = job["id"]
+
+    job_event_hub.publish(job)
+    queue = job_event_hub.subscribe(job_id)
+
+    try:
+        while True:
+            try:
+                latest_job = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=settings.JOB_EVENTS_HEARTBEAT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield format_job_event(latest_job)
+
+            if latest_job.get("status") in TERMINAL_JOB_STATUSES:
+                break
+
+    finally:
+        job_event_hub.unsubscribe(job_id, queue)
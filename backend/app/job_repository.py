@@ -1,9 +1,22 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import uuid
 from datetime import datetime, timezone
+from app.config import settings
+from app.job_cache import JobCache
 from app.supabase_client import supabase
 
 
+# Parent row plus both child tables in one PostgREST request, embedded
+# through the child tables' job_id foreign key.
+JOB_DETAILS_SELECT = "*, youtube_audio_jobs(*), youtube_video_jobs(*)"
+
+_job_cache = JobCache(
+    max_entries=settings.JOB_CACHE_MAX_ENTRIES,
+    terminal_ttl_seconds=settings.JOB_CACHE_TERMINAL_TTL_SECONDS,
+    active_ttl_seconds=settings.JOB_CACHE_ACTIVE_TTL_SECONDS,
+)
+
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -157,35 +170,218 @@ def get_youtube_job_by_id(job_id: str) -> Optional[Dict[str, Any]]:
     return response.data[0]
 
 
+def embedded_row(value: Any) -> Optional[Dict[str, Any]]:
+    # PostgREST embeds a one-to-one child as an object and a one-to-many
+    # child as a list, depending on whether job_id is unique.
+    if isinstance(value, list):
+        return value[0] if value else None
+
+    return value
+
+
+def attach_job_details(job: Dict[str, Any]) -> Dict[str, Any]:
+    audio_details = embedded_row(job.pop("youtube_audio_jobs", None))
+    video_details = embedded_row(job.pop("youtube_video_jobs", None))
+
+    if job["mode"] == "audio":
+        job["audio_details"] = audio_details
+
+    if job["mode"] == "video":
+        job["video_details"] = video_details
+
+    return job
+
+
+def get_youtube_job_entry(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"job", "etag"} for the job with its details, or None.
+
+    Served from the job cache when possible, otherwise fetched with a
+    single embedded select and cached.
+    """
+
+    entry = _job_cache.get_entry(job_id)
+
+    if entry is not None:
+        return entry
+
+    response = (
+        supabase
+        .table("youtube_jobs")
+        .select(JOB_DETAILS_SELECT)
+        .eq("id", job_id)
+        .execute()
+    )
+
+    if not response.data:
+        return None
+
+    return _job_cache.put(attach_job_details(response.data[0]))
+
+
 def get_youtube_job_with_details(job_id: str) -> Optional[Dict[str, Any]]:
-    job = get_youtube_job_by_id(job_id)
+    entry = get_youtube_job_entry(job_id)
 
-    if not job:
+    if entry is None:
         return None
 
-    if job["mode"] == "audio":
-        audio_response = (
-            supabase
-            .table("youtube_audio_jobs")
-            .select("*")
-            .eq("job_id", job_id)
-            .execute()
-        )
+    return entry["job"]
 
-        job["audio_details"] = audio_response.data[0] if audio_response.data else None
 
-    if job["mode"] == "video":
-        video_response = (
-            supabase
-            .table("youtube_video_jobs")
-            .select("*")
-            .eq("job_id", job_id)
-            .execute()
-        )
+def get_youtube_jobs_with_details(job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    get_youtube_job_with_details for many jobs at once, in one query and
+    bypassing the cache. Returns jobs by id; missing ids are left out.
+    The fresh rows refresh the job cache.
+    """
 
-        job["video_details"] = video_response.data[0] if video_response.data else None
+    if not job_ids:
+        return {}
+
+    response = (
+        supabase
+        .table("youtube_jobs")
+        .select(JOB_DETAILS_SELECT)
+        .in_("id", job_ids)
+        .execute()
+    )
+
+    jobs = {}
+
+    for row in response.data or []:
+        job = _job_cache.put(attach_job_details(row))["job"]
+        jobs[job["id"]] = job
+
+    return jobs
 
-    return job
+
+def get_job_cache_stats() -> Dict[str, Any]:
+    return _job_cache.stats()
+
+
+def list_ready_audio_jobs(
+    job_ids: Optional[List[str]] = None,
+    limit: int = 500,
+) -> List[Dict[str, Any]]:
+    """
+    Returns ready dialogue jobs with their transcript blob name, newest first.
+    Limited to job_ids when given, otherwise the whole library.
+
+    transcript_updated_at changes whenever a worker rewrites the
+    transcript, so library search can tell a cached shard is stale.
+    """
+
+    query = (
+        supabase
+        .table("youtube_jobs")
+        .select("id, source_type, youtube_id, video_title, original_file_name")
+        .eq("mode", "audio")
+        .eq("status", "ready")
+    )
+
+    if job_ids is not None:
+        if not job_ids:
+            return []
+
+        query = query.in_("id", job_ids)
+
+    jobs_response = (
+        query
+        .order("created_at", desc=True)
+        .limit(limit)
+        .execute()
+    )
+
+    jobs = jobs_response.data or []
+
+    if not jobs:
+        return []
+
+    audio_response = (
+        supabase
+        .table("youtube_audio_jobs")
+        .select("job_id, transcript_blob_name, updated_at")
+        .in_("job_id", [job["id"] for job in jobs])
+        .execute()
+    )
+
+    audio_rows = {
+        row["job_id"]: row
+        for row in audio_response.data or []
+    }
+
+    ready_jobs = []
+
+    for job in jobs:
+        audio_row = audio_rows.get(job["id"]) or {}
+        blob_name = audio_row.get("transcript_blob_name")
+
+        if blob_name:
+            job["transcript_blob_name"] = blob_name
+            job["transcript_updated_at"] = audio_row.get("updated_at")
+            ready_jobs.append(job)
+
+    return ready_jobs
+
+
+def list_ready_video_jobs(
+    job_ids: Optional[List[str]] = None,
+    limit: int = 500,
+) -> List[Dict[str, Any]]:
+    """
+    Returns ready visual search jobs with their vector namespace, newest
+    first. Limited to job_ids when given, otherwise the whole library.
+    """
+
+    query = (
+        supabase
+        .table("youtube_jobs")
+        .select("id, source_type, youtube_id, video_title, original_file_name")
+        .eq("mode", "video")
+        .eq("status", "ready")
+    )
+
+    if job_ids is not None:
+        if not job_ids:
+            return []
+
+        query = query.in_("id", job_ids)
+
+    jobs_response = (
+        query
+        .order("created_at", desc=True)
+        .limit(limit)
+        .execute()
+    )
+
+    jobs = jobs_response.data or []
+
+    if not jobs:
+        return []
+
+    video_response = (
+        supabase
+        .table("youtube_video_jobs")
+        .select("job_id, visual_status, pinecone_namespace")
+        .in_("job_id", [job["id"] for job in jobs])
+        .execute()
+    )
+
+    video_details = {
+        row["job_id"]: row
+        for row in video_response.data or []
+    }
+
+    ready_jobs = []
+
+    for job in jobs:
+        details = video_details.get(job["id"])
+
+        if details and details.get("visual_status") == "ready":
+            job["pinecone_namespace"] = details.get("pinecone_namespace") or job["id"]
+            ready_jobs.append(job)
+
+    return ready_jobs
 
 
 def mark_job_worker_trigger_failed(
@@ -203,4 +399,6 @@ def mark_job_worker_trigger_failed(
         })
         .eq("id", job_id)
         .execute()
-    )
\ No newline at end of file
+    )
+
+    _job_cache.invalidate(job_id)
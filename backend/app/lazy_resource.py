@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class LazyResource:
+    """
+    A heavy process-wide singleton (model, client) built on first use.
+
+    Loading is single-flight: concurrent first callers wait on one load
+    instead of each building their own copy, which for CLIP would load the
+    weights several times over. A failed load is not cached; the next
+    caller tries again.
+
+    The load is timed, and stats() reports state, load time and the last
+    error for the readiness probe.
+    """
+
+    def __init__(self, name: str, load: Callable[[], Any]):
+        self.name = name
+        self._load = load
+
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        self.state = "not_loaded"
+        self.load_seconds: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.attempts = 0
+
+        _resources.append(self)
+
+    def get(self) -> Any:
+        if self._loaded:
+            return self._value
+
+        with self._lock:
+            if self._loaded:
+                return self._value
+
+            self.state = "loading"
+            self.attempts += 1
+            started = time.perf_counter()
+
+            try:
+                value = self._load()
+            except Exception as error:
+                self.state = "failed"
+                self.last_error = str(error)
+                print(f"[Load] {self.name} failed after {time.perf_counter() - started:.2f}s: {error}")
+                raise
+
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            self.loaded_at = time.time()
+            self.last_error = None
+            self._value = value
+            self._loaded = True
+            self.state = "ready"
+
+            print(f"[Load] {self.name} ready in {self.load_seconds:.2f}s.")
+
+            return value
+
+    def is_ready(self) -> bool:
+        return self._loaded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "loaded_at": self.loaded_at,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+        }
+
+
+_resources: List[LazyResource] = []
+
+
+def get_resource_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        resource.name: resource.stats()
+        for resource in _resources
+    }
@@ -1,50 +1,68 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 import threading
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uuid
 from fastapi import UploadFile, File, Form
-from fastapi import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.youtube_utils import extract_youtube_id
 from app.modal_client import trigger_modal_processing, trigger_modal_upload_processing
 from app.job_repository import (
     create_youtube_job as create_job_record,
     get_youtube_job_by_id,
+    get_youtube_job_entry,
     get_youtube_job_with_details,
+    get_job_cache_stats,
     mark_job_worker_trigger_failed, 
-    create_upload_job
+    create_upload_job,
+    list_ready_audio_jobs,
+    list_ready_video_jobs,
 )
 
-from app.azure_utils import load_transcript_json, upload_media_file_to_azure, delete_media_blob_from_azure, create_upload_sas_url
-from app.search.dialogue_search import search_dialogue_in_transcript
+from app.azure_utils import get_blob_service_client, load_transcript, load_transcript_index, load_transcript_embeddings, get_transcript_search_state, get_transcript_cache_stats, upload_media_file_to_azure, delete_media_blob_from_azure, create_upload_sas_url
+from app.search.dialogue_search import search_dialogue_in_transcript, search_dialogue_semantic
+from app.search.dialogue_library import get_library_shard_cache_stats, search_dialogue_library
+from app.config import settings
+from app.lazy_resource import get_resource_stats
+from app.inference import InferenceBusyError, get_inference_stats
+from app.job_events import job_event_hub, stream_job_events
+
+# Visual search needs these loaded before an instance counts as ready.
+READY_RESOURCES = ("clip_text_engine", "vector_store", "azure_blob_client")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     threading.Thread(
-        target=warmup_clip_in_background,
+        target=warmup_in_background,
         daemon=True,
     ).start()
 
     yield
 
-app = FastAPI(title="Momentum YouTube V1 Backend",lifespan=lifespan)
+    from app.search.visual_search import close_vector_store
 
-def warmup_clip_in_background():
     try:
-        from app.search.visual_search import warmup_clip_model
-        warmup_clip_model()
+        await close_vector_store()
     except Exception as error:
-        print(f"[startup warmup] CLIP warmup failed: {error}")
+        print(f"[shutdown] Vector store close failed: {error}")
 
+app = FastAPI(title="Momentum YouTube V1 Backend",lifespan=lifespan)
 
-@app.on_event("startup")
-def startup_event():
-    threading.Thread(
-        target=warmup_clip_in_background,
-        daemon=True,
-    ).start()
+def warmup_in_background():
+    try:
+        get_blob_service_client()
+    except Exception as error:
+        print(f"[startup warmup] Azure client failed: {error}")
+
+    try:
+        from app.search.visual_search import warmup_visual_search
+        warmup_visual_search()
+    except Exception as error:
+        print(f"[startup warmup] Visual search warmup failed: {error}")
 
 
 app.add_middleware(
@@ -68,6 +86,37 @@ class SearchVisualRequest(BaseModel):
 class SearchDialogueRequest(BaseModel):
     job_id: str
     query: str
+    context_lines: int = 1
+    fuzzy: bool = True
+    search_mode: str = "keyword"
+
+class SearchVisualBatchRequest(BaseModel):
+    job_id: str
+    queries: list[str]
+
+class SearchDialogueBatchRequest(BaseModel):
+    job_id: str
+    queries: list[str]
+    context_lines: int = 1
+    fuzzy: bool = True
+    search_mode: str = "keyword"
+
+class SearchDialogueLibraryRequest(BaseModel):
+    query: str
+    job_ids: list[str] | None = None
+    max_results: int = 10
+    context_lines: int = 1
+
+class SearchVisualSequenceRequest(BaseModel):
+    job_id: str
+    queries: list[str]
+    max_gap_seconds: float = 30
+    top_k: int = 3
+
+class SearchVisualLibraryRequest(BaseModel):
+    query: str
+    job_ids: list[str] | None = None
+    max_results: int = 10
 
 class CompleteUploadRequest(BaseModel):
     filename: str
@@ -84,15 +133,55 @@ class CreateUploadUrlRequest(BaseModel):
     file_size: int | None = None
 
 @app.get("/")
-def health_check():
+async def health_check():
     return {
         "status": "ok",
         "message": "Momentum YouTube V1 backend is running",
     }
 
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe for the load balancer: 200 once the models and clients
+    visual search needs are loaded, 503 until then. Unlike /, it fails
+    while an instance is still warming up.
+    """
+
+    resources = get_resource_stats()
+    ready = all(
+        resources.get(name, {}).get("state") == "ready"
+        for name in READY_RESOURCES
+    )
+
+    return JSONResponse(
+        {
+            "ready": ready,
+            "resources": resources,
+        },
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/search/cache-stats")
+async def search_cache_stats():
+    from app.search.visual_search import (
+        get_clip_batcher_stats,
+        get_query_embedding_cache_stats,
+    )
+
+    return {
+        "transcripts": get_transcript_cache_stats(),
+        "library_shards": get_library_shard_cache_stats(),
+        "query_embeddings": get_query_embedding_cache_stats(),
+        "clip_batches": get_clip_batcher_stats(),
+        "inference": get_inference_stats(),
+        "job_events": job_event_hub.stats(),
+        "jobs": get_job_cache_stats(),
+    }
+
 @app.post("/upload/jobs")
 async def create_local_upload_job(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     mode: str = Form("video"),
 ):
@@ -113,14 +202,16 @@ async def create_local_upload_job(
 
         job_id_for_blob = str(uuid.uuid4())
 
-        upload_info = upload_media_file_to_azure(
+        upload_info = await run_in_threadpool(
+            upload_media_file_to_azure,
             file_obj=file.file,
             filename=file.filename,
             content_type=file.content_type,
             job_id=job_id_for_blob,
         )
 
-        job = create_upload_job(
+        job = await run_in_threadpool(
+            create_upload_job,
             original_file_name=file.filename,
             media_blob_name=upload_info["blob_name"],
             media_blob_url=upload_info["blob_url"],
@@ -130,7 +221,8 @@ async def create_local_upload_job(
         )
 
         try:
-            trigger_modal_upload_processing(
+            await run_in_threadpool(
+                trigger_modal_upload_processing,
                 job_id=job["id"],
                 media_blob_name=upload_info["blob_name"],
                 media_blob_url=upload_info["blob_url"],
@@ -138,7 +230,8 @@ async def create_local_upload_job(
                 mode=mode,
             )
         except Exception as modal_error:
-            mark_job_worker_trigger_failed(
+            await run_in_threadpool(
+                mark_job_worker_trigger_failed,
                 job_id=job["id"],
                 error_message=str(modal_error),
             )
@@ -148,10 +241,6 @@ async def create_local_upload_job(
                 detail=f"Upload job created but failed to trigger worker: {modal_error}",
             )
 
-        if mode == "video":
-            from app.search.visual_search import warmup_clip_model
-            background_tasks.add_task(warmup_clip_model)
-
         return {
             "job_id": job["id"],
             "source_type": "upload",
@@ -171,16 +260,16 @@ async def create_local_upload_job(
     
 
 @app.get("/upload/jobs/{job_id}")
-def get_upload_job(job_id: str):
-    job = get_youtube_job_with_details(job_id)
+async def get_upload_job(job_id: str, request: Request):
+    return await get_youtube_job(job_id, request)
 
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found.")
 
-    return job
+@app.get("/upload/jobs/{job_id}/events")
+async def stream_upload_job_events(job_id: str):
+    return await stream_youtube_job_events(job_id)
 
 @app.post("/upload/presign")
-def create_upload_presigned_url(payload: CreateUploadUrlRequest):
+async def create_upload_presigned_url(payload: CreateUploadUrlRequest):
     try:
         mode = payload.mode.lower().strip()
 
@@ -211,9 +300,8 @@ def create_upload_presigned_url(payload: CreateUploadUrlRequest):
     
 
 @app.post("/upload/complete")
-def complete_direct_upload(
+async def complete_direct_upload(
     payload: CompleteUploadRequest,
-    background_tasks: BackgroundTasks,
 ):
     try:
         mode = payload.mode.lower().strip()
@@ -224,7 +312,8 @@ def complete_direct_upload(
                 detail="mode must be either 'video' or 'audio'.",
             )
 
-        job = create_upload_job(
+        job = await run_in_threadpool(
+            create_upload_job,
             original_file_name=payload.filename,
             media_blob_name=payload.blob_name,
             media_blob_url=payload.blob_url,
@@ -233,7 +322,8 @@ def complete_direct_upload(
             mode=mode,
         )
 
-        trigger_modal_upload_processing(
+        await run_in_threadpool(
+            trigger_modal_upload_processing,
             job_id=job["id"],
             media_blob_name=payload.blob_name,
             media_blob_url=payload.blob_url,
@@ -241,10 +331,6 @@ def complete_direct_upload(
             mode=mode,
         )
 
-        if mode == "video":
-            from app.search.visual_search import warmup_clip_model
-            background_tasks.add_task(warmup_clip_model)
-
         return {
             "job_id": job["id"],
             "source_type": "upload",
@@ -260,18 +346,42 @@ def complete_direct_upload(
         raise HTTPException(status_code=500, detail=str(error))
 
 @app.post("/upload/search-visual")
-def search_upload_visual(payload: SearchVisualRequest):
-    return search_visual(payload)
+async def search_upload_visual(payload: SearchVisualRequest):
+    return await search_visual(payload)
 
 
 @app.post("/upload/search-dialogue")
-def search_upload_dialogue(payload: SearchDialogueRequest):
-    return search_dialogue(payload)
+async def search_upload_dialogue(payload: SearchDialogueRequest):
+    return await search_dialogue(payload)
+
+
+@app.post("/upload/search-visual/image")
+async def search_upload_visual_by_image(
+    job_id: str = Form(...),
+    image: UploadFile = File(...),
+    top_k: int = Form(3),
+):
+    return await search_visual_by_image(job_id=job_id, image=image, top_k=top_k)
+
+
+@app.post("/upload/search-visual/sequence")
+async def search_upload_visual_sequence(payload: SearchVisualSequenceRequest):
+    return await search_visual_sequence(payload)
+
+
+@app.post("/upload/search-visual/batch")
+async def search_upload_visual_batch(payload: SearchVisualBatchRequest):
+    return await search_visual_batch(payload)
+
+
+@app.post("/upload/search-dialogue/batch")
+async def search_upload_dialogue_batch(payload: SearchDialogueBatchRequest):
+    return await search_dialogue_batch(payload)
 
 @app.delete("/upload/jobs/{job_id}/file")
-def delete_uploaded_file(job_id: str):
+async def delete_uploaded_file(job_id: str):
     try:
-        job = get_youtube_job_with_details(job_id)
+        job = await run_in_threadpool(get_youtube_job_with_details, job_id)
 
         if not job:
             raise HTTPException(status_code=404, detail="Job not found.")
@@ -292,7 +402,7 @@ def delete_uploaded_file(job_id: str):
                 "message": "No uploaded blob found for this job.",
             }
 
-        deleted = delete_media_blob_from_azure(blob_name)
+        deleted = await run_in_threadpool(delete_media_blob_from_azure, blob_name)
 
         return {
             "ok": True,
@@ -307,7 +417,7 @@ def delete_uploaded_file(job_id: str):
         raise HTTPException(status_code=500, detail=str(error))
 
 @app.post("/youtube/jobs")
-def create_youtube_job(payload: CreateYouTubeJobRequest, background_tasks: BackgroundTasks):
+async def create_youtube_job(payload: CreateYouTubeJobRequest):
     try:
         mode = payload.mode.lower().strip()
 
@@ -319,7 +429,8 @@ def create_youtube_job(payload: CreateYouTubeJobRequest, background_tasks: Backg
 
         youtube_id = extract_youtube_id(payload.youtube_url)
 
-        job = create_job_record(
+        job = await run_in_threadpool(
+            create_job_record,
             youtube_url=payload.youtube_url,
             youtube_id=youtube_id,
             mode=mode,
@@ -328,14 +439,16 @@ def create_youtube_job(payload: CreateYouTubeJobRequest, background_tasks: Backg
         job_id = job["id"]
 
         try:
-            trigger_modal_processing(
+            await run_in_threadpool(
+                trigger_modal_processing,
                 job_id=job_id,
                 youtube_url=payload.youtube_url,
                 youtube_id=youtube_id,
                 mode=mode,
             )
         except Exception as modal_error:
-            mark_job_worker_trigger_failed(
+            await run_in_threadpool(
+                mark_job_worker_trigger_failed,
                 job_id=job_id,
                 error_message=str(modal_error),
             )
@@ -344,10 +457,6 @@ def create_youtube_job(payload: CreateYouTubeJobRequest, background_tasks: Backg
                 status_code=500,
                 detail=f"Job created but failed to trigger worker: {modal_error}",
             )
-        
-        if mode == "video":
-            from app.search.visual_search import warmup_clip_model
-            background_tasks.add_task(warmup_clip_model)
 
         return {
             "job_id": job_id,
@@ -369,65 +478,320 @@ def create_youtube_job(payload: CreateYouTubeJobRequest, background_tasks: Backg
 
 
 @app.get("/youtube/jobs/{job_id}")
-def get_youtube_job(job_id: str):
-    job = get_youtube_job_with_details(job_id)
+async def get_youtube_job(job_id: str, request: Request):
+    """
+    Answers If-None-Match with 304 while the job is unchanged, so pollers
+    only download it again when its state moved.
+    """
+
+    entry = await run_in_threadpool(get_youtube_job_entry, job_id)
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+
+    if entry["etag"] in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(entry["job"], headers=headers)
+
+
+@app.get("/youtube/jobs/{job_id}/events")
+async def stream_youtube_job_events(job_id: str):
+    """
+    Server-Sent Events stream of the job, pushed when its state changes
+    and closed once it is ready or failed.
+    """
+
+    job = await run_in_threadpool(get_youtube_job_with_details, job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
 
-    return job
+    return StreamingResponse(
+        stream_job_events(job),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
-@app.post("/youtube/search-dialogue")
-def search_dialogue(payload: SearchDialogueRequest):
+
+def get_ready_transcript_blob_name(job_id: str) -> str:
     """
-    Searches remembered dialogue inside the transcript JSON stored in Azure.
+    Checks that a dialogue job is ready to search and returns its transcript
+    blob name. Raises HTTPException otherwise.
     """
 
-    try:
-        job = get_youtube_job_with_details(payload.job_id)
+    job = get_youtube_job_with_details(job_id)
 
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found.")
-        
-        if job["mode"] != "audio":
-            raise HTTPException(
-                status_code=400,
-                detail="This job is not an audio search job.",
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    if job["mode"] != "audio":
+        raise HTTPException(
+            status_code=400,
+            detail="This job is not an audio search job.",
+        )
+
+    if job["status"] != "ready":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job is not ready yet. Current status: {job['status']}",
+        )
+
+    audio_details = job.get("audio_details")
+
+    if not audio_details:
+        raise HTTPException(
+            status_code=500,
+            detail="Audio details are missing for this job.",
+        )
+
+    blob_name = audio_details.get("transcript_blob_name")
+
+    if not blob_name:
+        raise HTTPException(
+            status_code=500,
+            detail="Transcript blob name is missing for this job.",
+        )
+
+    return blob_name
+
+
+def parse_search_mode(search_mode: str) -> str:
+    search_mode = search_mode.lower().strip()
+
+    if search_mode not in {"keyword", "semantic"}:
+        raise HTTPException(
+            status_code=400,
+            detail="search_mode must be either 'keyword' or 'semantic'.",
+        )
+
+    return search_mode
+
+
+def check_batch_queries(queries: list[str]) -> None:
+    if not queries:
+        raise HTTPException(status_code=400, detail="queries must not be empty.")
+
+    if len(queries) > settings.SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.SEARCH_BATCH_MAX_QUERIES} queries can be sent at once.",
+        )
+
+
+def search_loaded_transcript(
+    blob_name: str,
+    queries: list[str],
+    search_mode: str,
+    context_lines: int,
+    fuzzy: bool,
+    query_vectors: dict[str, list[float]] | None = None,
+    segment_embeddings=None,
+) -> list[list[dict]]:
+    """
+    Runs every query against one transcript, loaded once. Semantic queries
+    use the vectors in query_vectors and the segment_embeddings matrix,
+    both loaded beforehand.
+    """
+
+    transcript_data = load_transcript(blob_name)
+    context_lines = max(0, min(context_lines, 5))
+
+    if search_mode == "semantic":
+        return [
+            search_dialogue_semantic(
+                transcript_data=transcript_data,
+                query_vector=query_vectors[query],
+                segment_embeddings=segment_embeddings,
+                max_results=3,
+                context_lines=context_lines,
             )
+            if query.strip() else []
+            for query in queries
+        ]
+
+    transcript_index = load_transcript_index(blob_name)
+    search_state = get_transcript_search_state(blob_name)
+
+    return [
+        search_dialogue_in_transcript(
+            transcript_data=transcript_data,
+            query=query,
+            max_results=3,
+            transcript_index=transcript_index,
+            search_state=search_state,
+            context_lines=context_lines,
+            fuzzy=fuzzy,
+        )
+        for query in queries
+    ]
 
-        if job["status"] != "ready":
+
+async def run_dialogue_searches(
+    blob_name: str,
+    queries: list[str],
+    search_mode: str,
+    context_lines: int,
+    fuzzy: bool,
+) -> list[list[dict]]:
+    """
+    Semantic queries are embedded together through the query cache and one
+    batched CLIP forward pass on the inference executor; loading and
+    searching the transcript run in the I/O threadpool.
+    """
+
+    query_vectors = None
+    segment_embeddings = None
+
+    if search_mode == "semantic":
+        segment_embeddings = await run_in_threadpool(load_transcript_embeddings, blob_name)
+
+        if segment_embeddings is None:
             raise HTTPException(
                 status_code=400,
-                detail=f"Job is not ready yet. Current status: {job['status']}",
+                detail="Semantic search is not available for this job. Process the video again to enable it.",
             )
 
-        audio_details = job.get("audio_details")
+        from app.search.visual_search import embed_text_queries
 
-        if not audio_details:
-            raise HTTPException(
-                status_code=500,
-                detail="Audio details are missing for this job.",
-            )
+        non_empty_queries = [query for query in queries if query.strip()]
+        query_vectors = dict(zip(
+            non_empty_queries,
+            await embed_text_queries(non_empty_queries),
+        ))
 
-        blob_name = audio_details.get("transcript_blob_name")
+    return await run_in_threadpool(
+        search_loaded_transcript,
+        blob_name,
+        queries,
+        search_mode,
+        context_lines,
+        fuzzy,
+        query_vectors,
+        segment_embeddings,
+    )
 
-        if not blob_name:
+
+@app.post("/youtube/search-dialogue")
+async def search_dialogue(payload: SearchDialogueRequest):
+    """
+    Searches remembered dialogue inside the transcript stored in Azure.
+    """
+
+    try:
+        search_mode = parse_search_mode(payload.search_mode)
+        blob_name = await run_in_threadpool(get_ready_transcript_blob_name, payload.job_id)
+
+        results = (await run_dialogue_searches(
+            blob_name=blob_name,
+            queries=[payload.query],
+            search_mode=search_mode,
+            context_lines=payload.context_lines,
+            fuzzy=payload.fuzzy,
+        ))[0]
+
+        return {
+            "job_id": payload.job_id,
+            "query": payload.query,
+            "search_mode": search_mode,
+            "count": len(results),
+            "results": results,
+        }
+
+    except HTTPException:
+        raise
+
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@app.post("/youtube/search-dialogue/batch")
+async def search_dialogue_batch(payload: SearchDialogueBatchRequest):
+    """
+    Runs several dialogue queries against one job with a single job lookup
+    and transcript load. Results are grouped per query, in query order.
+    """
+
+    try:
+        check_batch_queries(payload.queries)
+        search_mode = parse_search_mode(payload.search_mode)
+        blob_name = await run_in_threadpool(get_ready_transcript_blob_name, payload.job_id)
+
+        grouped_results = await run_dialogue_searches(
+            blob_name=blob_name,
+            queries=payload.queries,
+            search_mode=search_mode,
+            context_lines=payload.context_lines,
+            fuzzy=payload.fuzzy,
+        )
+
+        return {
+            "job_id": payload.job_id,
+            "search_mode": search_mode,
+            "searches": [
+                {
+                    "query": query,
+                    "count": len(results),
+                    "results": results,
+                }
+                for query, results in zip(payload.queries, grouped_results)
+            ],
+        }
+
+    except HTTPException:
+        raise
+
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@app.post("/youtube/search-dialogue/library")
+async def search_dialogue_across_library(payload: SearchDialogueLibraryRequest):
+    """
+    Searches remembered dialogue across many ready transcripts at once:
+    the given job_ids, or the whole library when job_ids is omitted.
+    """
+
+    try:
+        if payload.job_ids is not None and len(payload.job_ids) > settings.LIBRARY_SEARCH_MAX_JOBS:
             raise HTTPException(
-                status_code=500,
-                detail="Transcript blob name is missing for this job.",
+                status_code=400,
+                detail=f"At most {settings.LIBRARY_SEARCH_MAX_JOBS} jobs can be searched at once.",
             )
 
-        transcript_data = load_transcript_json(blob_name)
+        jobs = await run_in_threadpool(
+            list_ready_audio_jobs,
+            job_ids=payload.job_ids,
+            limit=settings.LIBRARY_SEARCH_MAX_JOBS,
+        )
 
-        results = search_dialogue_in_transcript(
-            transcript_data=transcript_data,
+        results = await run_in_threadpool(
+            search_dialogue_library,
+            jobs=jobs,
             query=payload.query,
-            max_results=3,
+            max_results=max(1, min(payload.max_results, 50)),
+            context_lines=max(0, min(payload.context_lines, 5)),
         )
 
         return {
-            "job_id": payload.job_id,
             "query": payload.query,
+            "searched_jobs": len(jobs),
             "count": len(results),
             "results": results,
         }
@@ -437,54 +801,167 @@ def search_dialogue(payload: SearchDialogueRequest):
 
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error))
-    
+
+
+def get_ready_visual_namespace(job_id: str) -> str:
+    """
+    Checks that a video job is ready to search and returns its Pinecone
+    namespace. Raises HTTPException otherwise.
+    """
+
+    job = get_youtube_job_with_details(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    if job["mode"] != "video":
+        raise HTTPException(
+            status_code=400,
+            detail="This job is not a video search job.",
+        )
+
+    if job["status"] != "ready":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job is not ready yet. Current status: {job['status']}",
+        )
+
+    video_details = job.get("video_details")
+
+    if not video_details:
+        raise HTTPException(
+            status_code=500,
+            detail="Video details are missing for this job.",
+        )
+
+    if video_details["visual_status"] != "ready":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Video index is not ready yet. Current status: {video_details['visual_status']}",
+        )
+
+    return video_details.get("pinecone_namespace") or job_id
+
 
 @app.post("/youtube/search-visual")
-def search_visual(payload: SearchVisualRequest):
+async def search_visual(payload: SearchVisualRequest):
     try:
-        job = get_youtube_job_with_details(payload.job_id)
+        pinecone_namespace = await run_in_threadpool(
+            get_ready_visual_namespace, payload.job_id
+        )
 
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found.")
+        from app.search.visual_search import search_visual_scenes_backend
 
-        if job["mode"] != "video":
-            raise HTTPException(
-                status_code=400,
-                detail="This job is not a video search job.",
-            )
+        result = await search_visual_scenes_backend(
+            job_id=payload.job_id,
+            namespace=pinecone_namespace,
+            query=payload.query,
+            top_k=3,
+        )
 
-        if job["status"] != "ready":
-            raise HTTPException(
-                status_code=400,
-                detail=f"Job is not ready yet. Current status: {job['status']}",
-            )
+        return {
+            "job_id": payload.job_id,
+            **result,
+        }
+
+    except HTTPException:
+        raise
+
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
 
-        video_details = job.get("video_details")
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@app.post("/youtube/search-visual/image")
+async def search_visual_by_image(
+    job_id: str = Form(...),
+    image: UploadFile = File(...),
+    top_k: int = Form(3),
+):
+    """
+    Finds the moments of a video job that match an uploaded still frame,
+    such as a screenshot.
+    """
 
-        if not video_details:
+    try:
+        image_data = await image.read(settings.IMAGE_QUERY_MAX_BYTES + 1)
+
+        if len(image_data) > settings.IMAGE_QUERY_MAX_BYTES:
             raise HTTPException(
-                status_code=500,
-                detail="Video details are missing for this job.",
+                status_code=413,
+                detail=f"Image is larger than {settings.IMAGE_QUERY_MAX_BYTES} bytes.",
             )
 
-        if video_details["visual_status"] != "ready":
+        if not image_data:
+            raise HTTPException(status_code=400, detail="Image is empty.")
+
+        pinecone_namespace = await run_in_threadpool(get_ready_visual_namespace, job_id)
+
+        from app.search.visual_search import load_query_image, search_visual_scenes_by_image
+
+        # Decoding and resizing are CPU work that should not hold an
+        # inference slot; only the CLIP forward pass runs there.
+        try:
+            query_image = await run_in_threadpool(load_query_image, image_data)
+        except ValueError as error:
+            # Only a bad upload is the client's fault.
+            raise HTTPException(status_code=400, detail=str(error))
+
+        result = await search_visual_scenes_by_image(
+            job_id=job_id,
+            namespace=pinecone_namespace,
+            image=query_image,
+            top_k=max(1, min(top_k, 20)),
+        )
+
+        return {
+            "job_id": job_id,
+            **result,
+        }
+
+    except HTTPException:
+        raise
+
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@app.post("/youtube/search-visual/sequence")
+async def search_visual_sequence(payload: SearchVisualSequenceRequest):
+    """
+    Finds moments where the queries appear in order, each within
+    max_gap_seconds of the previous one.
+    """
+
+    try:
+        queries = [query.strip() for query in payload.queries]
+
+        if not 2 <= len(queries) <= settings.SEQUENCE_MAX_STEPS or not all(queries):
             raise HTTPException(
                 status_code=400,
-                detail=f"Video index is not ready yet. Current status: {video_details['visual_status']}",
+                detail=f"Send between 2 and {settings.SEQUENCE_MAX_STEPS} non-empty queries.",
             )
 
-        pinecone_namespace = (
-            video_details.get("pinecone_namespace")
-            or payload.job_id
+        if payload.max_gap_seconds < 0:
+            raise HTTPException(status_code=400, detail="max_gap_seconds must not be negative.")
+
+        pinecone_namespace = await run_in_threadpool(
+            get_ready_visual_namespace, payload.job_id
         )
 
-        from app.search.visual_search import search_visual_scenes_backend
+        from app.search.visual_search import search_visual_sequence as run_sequence_search
 
-        result = search_visual_scenes_backend(
+        result = await run_sequence_search(
             job_id=payload.job_id,
             namespace=pinecone_namespace,
-            query=payload.query,
-            top_k=3,
+            queries=queries,
+            max_gap_seconds=payload.max_gap_seconds,
+            top_k=max(1, min(payload.top_k, 20)),
         )
 
         return {
@@ -495,5 +972,90 @@ def search_visual(payload: SearchVisualRequest):
     except HTTPException:
         raise
 
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+
     except Exception as error:
-        raise HTTPException(status_code=500, detail=str(error))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@app.post("/youtube/search-visual/batch")
+async def search_visual_batch(payload: SearchVisualBatchRequest):
+    """
+    Runs several visual queries against one job: one job lookup, one CLIP
+    forward pass for all queries and concurrent Pinecone lookups.
+    """
+
+    try:
+        check_batch_queries(payload.queries)
+        pinecone_namespace = await run_in_threadpool(
+            get_ready_visual_namespace, payload.job_id
+        )
+
+        from app.search.visual_search import search_visual_scenes_backend_batch
+
+        searches = await search_visual_scenes_backend_batch(
+            job_id=payload.job_id,
+            namespace=pinecone_namespace,
+            queries=payload.queries,
+            top_k=3,
+        )
+
+        return {
+            "job_id": payload.job_id,
+            "searches": searches,
+        }
+
+    except HTTPException:
+        raise
+
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@app.post("/youtube/search-visual/library")
+async def search_visual_across_library(payload: SearchVisualLibraryRequest):
+    """
+    Runs one visual query across many ready video jobs: the given job_ids,
+    or the whole library when job_ids is omitted.
+    """
+
+    try:
+        if payload.job_ids is not None and len(payload.job_ids) > settings.LIBRARY_SEARCH_MAX_JOBS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.LIBRARY_SEARCH_MAX_JOBS} jobs can be searched at once.",
+            )
+
+        jobs = await run_in_threadpool(
+            list_ready_video_jobs,
+            job_ids=payload.job_ids,
+            limit=settings.LIBRARY_SEARCH_MAX_JOBS,
+        )
+
+        from app.search.visual_search import search_visual_library
+
+        results = await search_visual_library(
+            jobs=jobs,
+            query=payload.query,
+            max_results=max(1, min(payload.max_results, 50)),
+        )
+
+        return {
+            "query": payload.query,
+            "searched_jobs": len(jobs),
+            "count": len(results),
+            "results": results,
+        }
+
+    except HTTPException:
+        raise
+
+    except InferenceBusyError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
@@ -1,4 +1,5 @@
 import os
+import threading
 import tempfile
 import uuid
 from datetime import datetime, timezone
@@ -39,6 +40,9 @@ image = (
         "numpy",
         "azure-storage-blob",
     )
+    # Ships app/search/vector_store.py so scene vectors go through the same
+    # store interface the backend searches with.
+    .add_local_python_source("app")
 )
 
 
@@ -341,6 +345,7 @@ def extract_frame_image_at_timestamp(video_path: str, timestamp: float):
 _clip_model = None
 _clip_processor = None
 _clip_device = None
+_clip_lock = threading.Lock()
 
 
 def get_clip_model_and_processor():
@@ -354,24 +359,32 @@ def get_clip_model_and_processor():
     if _clip_model is not None and _clip_processor is not None:
         return _clip_model, _clip_processor, _clip_device
 
-    import torch
-    from transformers import CLIPModel, CLIPProcessor
+    # Concurrent first calls wait for one load instead of each loading
+    # their own copy of the weights.
+    with _clip_lock:
+        if _clip_model is None:
+            import torch
+            from transformers import CLIPModel, CLIPProcessor
+
+            model_name = "openai/clip-vit-base-patch32"
 
-    model_name = "openai/clip-vit-base-patch32"
+            device = "cpu"
 
-    _clip_device = "cpu"
+            # Optional CPU thread tuning.
+            # You can adjust this later depending on Modal CPU allocation.
+            torch.set_num_threads(2)
 
-    # Optional CPU thread tuning.
-    # You can adjust this later depending on Modal CPU allocation.
-    torch.set_num_threads(2)
+            print(f"[CLIP] Using device: {device}")
 
-    print(f"[CLIP] Using device: {_clip_device}")
+            model = CLIPModel.from_pretrained(model_name)
+            processor = CLIPProcessor.from_pretrained(model_name)
 
-    _clip_model = CLIPModel.from_pretrained(model_name)
-    _clip_processor = CLIPProcessor.from_pretrained(model_name)
+            model.to(device)
+            model.eval()
 
-    _clip_model.to(_clip_device)
-    _clip_model.eval()
+            _clip_processor = processor
+            _clip_device = device
+            _clip_model = model
 
     return _clip_model, _clip_processor, _clip_device
 
@@ -424,11 +437,61 @@ def embed_images_batch(images) -> List[List[float]]:
     return [normalize_vector(vector) for vector in vectors]
 
 
-def get_pinecone_index():
-    from pinecone import Pinecone
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+
+def get_vector_store():
+    global _vector_store
+
+    if _vector_store is not None:
+        return _vector_store
+
+    with _vector_store_lock:
+        if _vector_store is None:
+            from app.search.vector_store import create_vector_store
+
+            _vector_store = create_vector_store(
+                os.environ.get("VECTOR_STORE", "pinecone"),
+                pinecone_api_key=os.environ.get("PINECONE_API_KEY", ""),
+                pinecone_index_name=os.environ.get("PINECONE_INDEX_NAME", ""),
+                local_dir=os.environ.get("LOCAL_VECTOR_STORE_DIR", "vector-store"),
+            )
+
+    return _vector_store
+
+
+def upload_scene_snapshot_to_azure(
+    job_id: str,
+    vectors: List[List[float]],
+    metadata: List[Dict[str, Any]],
+) -> str:
+    """
+    Uploads the job's scene vectors and metadata as <job_id>.scenes.npz
+    to the transcripts container, so the backend can search the job
+    in-process. Returns blob_name.
+    """
+
+    from azure.storage.blob import BlobServiceClient, ContentSettings
+    from app.search.scene_snapshot import encode_scene_snapshot
+
+    blob_service = BlobServiceClient.from_connection_string(
+        os.environ["AZURE_STORAGE_CONNECTION_STRING"]
+    )
+
+    blob_name = f"{job_id}.scenes.npz"
+    blob_client = blob_service.get_blob_client(
+        container=os.environ.get("AZURE_TRANSCRIPTS_CONTAINER", "transcripts"),
+        blob=blob_name,
+    )
+
+    blob_client.upload_blob(
+        encode_scene_snapshot(vectors, metadata),
+        overwrite=True,
+        content_settings=ContentSettings(content_type="application/octet-stream"),
+    )
 
-    pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-    return pc.Index(os.environ["PINECONE_INDEX_NAME"])
+    return blob_name
 
 
 def format_timestamp(seconds: float) -> str:
@@ -457,7 +520,7 @@ def index_video_scenes(
     media_blob_url: str | None = None,
     original_file_name: str | None = None,
 ) -> int:
-    index = get_pinecone_index()
+    vector_store = get_vector_store()
 
     scenes = detect_scenes(video_path)
 
@@ -478,6 +541,8 @@ def index_video_scenes(
 
     indexed_count = 0
     pending_vectors = []
+    snapshot_vectors = []
+    snapshot_metadata = []
 
     for scene in scenes:
         scene_index = scene["scene_index"]
@@ -517,14 +582,16 @@ def index_video_scenes(
 
                 vector_id = f"{job_id}-{metadata_item['scene_index']}"
                 pending_vectors.append((vector_id, embedding, metadata_item))
+                snapshot_vectors.append(embedding)
+                snapshot_metadata.append(metadata_item)
 
             image_batch.clear()
             metadata_batch.clear()
 
             if len(pending_vectors) >= pinecone_batch_size:
-                index.upsert(
-                    vectors=pending_vectors,
+                vector_store.upsert(
                     namespace=namespace,
+                    vectors=pending_vectors,
                 )
 
                 indexed_count += len(pending_vectors)
@@ -547,11 +614,13 @@ def index_video_scenes(
 
             vector_id = f"{job_id}-{metadata_item['scene_index']}"
             pending_vectors.append((vector_id, embedding, metadata_item))
+            snapshot_vectors.append(embedding)
+            snapshot_metadata.append(metadata_item)
 
     if pending_vectors:
-        index.upsert(
-            vectors=pending_vectors,
+        vector_store.upsert(
             namespace=namespace,
+            vectors=pending_vectors,
         )
 
         indexed_count += len(pending_vectors)
@@ -563,6 +632,18 @@ def index_video_scenes(
 
         print(f"[Pinecone] Final upsert complete. Total: {indexed_count}")
 
+    vector_store.flush(namespace)
+
+    try:
+        upload_scene_snapshot_to_azure(
+            job_id=job_id,
+            vectors=snapshot_vectors,
+            metadata=snapshot_metadata,
+        )
+    except Exception as snapshot_error:
+        # Search falls back to the vector store without a snapshot.
+        print(f"[snapshot] Could not upload scene snapshot: {snapshot_error}")
+
     return indexed_count
 
 
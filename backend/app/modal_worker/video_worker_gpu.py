@@ -1,4 +1,5 @@
 import os
+import threading
 import tempfile
 import uuid
 from datetime import datetime, timezone
@@ -39,6 +40,9 @@ image = (
         "numpy",
         "azure-storage-blob",
     )
+    # Ships app/search/vector_store.py so scene vectors go through the same
+    # store interface the backend searches with.
+    .add_local_python_source("app")
 )
 
 
@@ -308,6 +312,7 @@ def extract_frame_image_at_timestamp(video_path: str, timestamp: float):
 _clip_model = None
 _clip_processor = None
 _clip_device = None
+_clip_lock = threading.Lock()
 
 
 def get_clip_model_and_processor():
@@ -316,20 +321,28 @@ def get_clip_model_and_processor():
     if _clip_model is not None and _clip_processor is not None:
         return _clip_model, _clip_processor, _clip_device
 
-    import torch
-    from transformers import CLIPModel, CLIPProcessor
+    # Concurrent first calls wait for one load instead of each loading
+    # their own copy of the weights.
+    with _clip_lock:
+        if _clip_model is None:
+            import torch
+            from transformers import CLIPModel, CLIPProcessor
+
+            model_name = "openai/clip-vit-base-patch32"
 
-    model_name = "openai/clip-vit-base-patch32"
+            device = "cuda" if torch.cuda.is_available() else "cpu"
 
-    _clip_device = "cuda" if torch.cuda.is_available() else "cpu"
+            print(f"[CLIP] Using device: {device}")
 
-    print(f"[CLIP] Using device: {_clip_device}")
+            model = CLIPModel.from_pretrained(model_name)
+            processor = CLIPProcessor.from_pretrained(model_name)
 
-    _clip_model = CLIPModel.from_pretrained(model_name)
-    _clip_processor = CLIPProcessor.from_pretrained(model_name)
+            model.to(device)
+            model.eval()
 
-    _clip_model.to(_clip_device)
-    _clip_model.eval()
+            _clip_processor = processor
+            _clip_device = device
+            _clip_model = model
 
     return _clip_model, _clip_processor, _clip_device
 
@@ -444,11 +457,28 @@ def embed_text(query: str) -> List[float]:
     return normalize_vector(vector)
 
 
-def get_pinecone_index():
-    from pinecone import Pinecone
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
 
-    pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-    return pc.Index(os.environ["PINECONE_INDEX_NAME"])
+def get_vector_store():
+    global _vector_store
+
+    if _vector_store is not None:
+        return _vector_store
+
+    with _vector_store_lock:
+        if _vector_store is None:
+            from app.search.vector_store import create_vector_store
+
+            _vector_store = create_vector_store(
+                os.environ.get("VECTOR_STORE", "pinecone"),
+                pinecone_api_key=os.environ.get("PINECONE_API_KEY", ""),
+                pinecone_index_name=os.environ.get("PINECONE_INDEX_NAME", ""),
+                local_dir=os.environ.get("LOCAL_VECTOR_STORE_DIR", "vector-store"),
+            )
+
+    return _vector_store
 
 
 def format_timestamp(seconds: float) -> str:
@@ -473,7 +503,7 @@ def index_video_scenes(
     youtube_id: str,
     video_path: str,
 ) -> int:
-    index = get_pinecone_index()
+    vector_store = get_vector_store()
     namespace = youtube_id
 
     scenes = detect_scenes(video_path)
@@ -527,9 +557,9 @@ def index_video_scenes(
             metadata_batch.clear()
 
             if len(pending_vectors) >= pinecone_batch_size:
-                index.upsert(
-                    vectors=pending_vectors,
+                vector_store.upsert(
                     namespace=namespace,
+                    vectors=pending_vectors,
                 )
 
                 indexed_count += len(pending_vectors)
@@ -556,9 +586,9 @@ def index_video_scenes(
 
     # Final Pinecone upsert
     if pending_vectors:
-        index.upsert(
-            vectors=pending_vectors,
+        vector_store.upsert(
             namespace=namespace,
+            vectors=pending_vectors,
         )
 
         indexed_count += len(pending_vectors)
@@ -570,6 +600,8 @@ def index_video_scenes(
 
         print(f"[Pinecone] Final upsert complete. Total: {indexed_count}")
 
+    vector_store.flush(namespace)
+
     return indexed_count
 
 
@@ -734,19 +766,14 @@ def start_video_processing(payload: StartVideoRequest):
 def search_visual_scenes(payload: VisualSearchRequest):
     query_vector = embed_text(payload.query)
 
-    index = get_pinecone_index()
-
     namespace = payload.youtube_id
 
-    search_response = index.query(
+    matches = get_vector_store().query(
+        namespace=namespace,
         vector=query_vector,
         top_k=payload.top_k,
-        namespace=namespace,
-        include_metadata=True,
     )
 
-    matches = search_response.get("matches", [])
-
     results = []
 
     for match in matches:
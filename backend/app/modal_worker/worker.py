@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 import tempfile
 import uuid
 from datetime import datetime, timezone
@@ -31,7 +32,14 @@ image = (
         "supabase",
         "azure-storage-blob",
         "pydantic",
+        "numpy",
+        "torch",
+        "transformers",
     )
+    # Ships app/search/dialogue_index.py and app/transcript_format.py so the
+    # transcript index and binary transcript are written with exactly the
+    # code the backend reads them with.
+    .add_local_python_source("app")
 )
 
 
@@ -255,9 +263,12 @@ def extract_audio_from_media(media_path: str, workdir: str) -> str:
     return output_path
 
 
-def transcribe_with_groq(audio_path: str) -> List[Dict[str, Any]]:
+def transcribe_with_groq(
+    audio_path: str,
+) -> tuple[List[Dict[str, Any]], Dict[str, List[Any]]]:
     """
-    Transcribes audio using Groq Whisper and returns timestamped segments.
+    Transcribes audio using Groq Whisper and returns timestamped segments
+    plus word timings as parallel text/start/end lists.
     """
 
     from groq import Groq
@@ -269,6 +280,7 @@ def transcribe_with_groq(audio_path: str) -> List[Dict[str, Any]]:
             file=audio_file,
             model="whisper-large-v3-turbo",
             response_format="verbose_json",
+            timestamp_granularities=["word", "segment"],
         )
 
     raw_segments = getattr(transcription, "segments", None)
@@ -303,19 +315,28 @@ def transcribe_with_groq(audio_path: str) -> List[Dict[str, Any]]:
     if not segments:
         raise RuntimeError("No transcript segments were produced.")
 
-    return segments
+    words: Dict[str, List[Any]] = {"text": [], "start": [], "end": []}
 
+    for word in getattr(transcription, "words", None) or []:
+        text = getattr(word, "word", None)
+        start = getattr(word, "start", None)
+        end = getattr(word, "end", None)
 
-def upload_transcript_to_azure(
-    job_id: str,
-    transcript_data: Dict[str, Any],
-) -> tuple[str, str]:
-    """
-    Uploads transcript JSON to Azure Blob.
-    Returns blob_name and blob_url.
-    """
+        if isinstance(word, dict):
+            text = word.get("word")
+            start = word.get("start")
+            end = word.get("end")
 
-    from azure.storage.blob import BlobServiceClient, ContentSettings
+        if text:
+            words["text"].append(text.strip())
+            words["start"].append(round(float(start or 0), 2))
+            words["end"].append(round(float(end or 0), 2))
+
+    return segments, words
+
+
+def get_transcripts_container_client():
+    from azure.storage.blob import BlobServiceClient
 
     connection_string = os.environ["AZURE_STORAGE_CONNECTION_STRING"]
     container_name = os.environ["AZURE_TRANSCRIPTS_CONTAINER"]
@@ -329,8 +350,24 @@ def upload_transcript_to_azure(
         # Container already exists, or creation is not allowed.
         pass
 
+    return container_client
+
+
+def upload_transcript_to_azure(
+    job_id: str,
+    transcript_data: Dict[str, Any],
+) -> tuple[str, str]:
+    """
+    Uploads transcript JSON to Azure Blob.
+    Returns blob_name and blob_url.
+    """
+
+    from azure.storage.blob import ContentSettings
+
+    container_client = get_transcripts_container_client()
+
     blob_name = f"{job_id}.json"
-    json_text = json.dumps(transcript_data, ensure_ascii=False, indent=2)
+    json_text = json.dumps(transcript_data, ensure_ascii=False, separators=(",", ":"))
 
     blob_client = container_client.get_blob_client(blob_name)
 
@@ -343,6 +380,174 @@ def upload_transcript_to_azure(
     return blob_name, blob_client.url
 
 
+def upload_binary_transcript_to_azure(
+    job_id: str,
+    transcript_data: Dict[str, Any],
+) -> str:
+    """
+    Uploads the compressed columnar transcript (app/transcript_format.py)
+    as <job_id>.transcript.bin. The backend reads it instead of the JSON.
+    Returns blob_name.
+    """
+
+    from azure.storage.blob import ContentSettings
+    from app.transcript_format import encode_binary_transcript
+
+    container_client = get_transcripts_container_client()
+
+    blob_name = f"{job_id}.transcript.bin"
+    blob_client = container_client.get_blob_client(blob_name)
+
+    blob_client.upload_blob(
+        encode_binary_transcript(transcript_data),
+        overwrite=True,
+        content_settings=ContentSettings(content_type="application/octet-stream"),
+    )
+
+    return blob_name
+
+
+def upload_transcript_index_to_azure(
+    job_id: str,
+    segments: List[Dict[str, Any]],
+    words: Dict[str, List[Any]] | None = None,
+) -> str:
+    """
+    Builds the dialogue search index and uploads it next to the transcript
+    as <job_id>.index.json. Returns blob_name.
+    """
+
+    from azure.storage.blob import ContentSettings
+    from app.search.dialogue_index import build_dialogue_index
+
+    transcript_index = build_dialogue_index(segments, words)
+
+    container_client = get_transcripts_container_client()
+
+    blob_name = f"{job_id}.index.json"
+    json_text = json.dumps(
+        transcript_index,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+    blob_client = container_client.get_blob_client(blob_name)
+
+    blob_client.upload_blob(
+        json_text,
+        overwrite=True,
+        content_settings=ContentSettings(content_type="application/json"),
+    )
+
+    return blob_name
+
+
+_clip_model = None
+_clip_tokenizer = None
+_clip_lock = threading.Lock()
+
+
+def get_clip_text_model_and_tokenizer():
+    """
+    Same CLIP checkpoint the backend embeds queries with, so segment and
+    query vectors live in the same space. Only the text tower is loaded.
+    """
+    global _clip_model, _clip_tokenizer
+
+    if _clip_model is not None and _clip_tokenizer is not None:
+        return _clip_model, _clip_tokenizer
+
+    # Concurrent first calls wait for one load instead of each loading
+    # their own copy of the weights.
+    with _clip_lock:
+        if _clip_model is None:
+            from transformers import CLIPTextModelWithProjection, CLIPTokenizerFast
+
+            model_name = "openai/clip-vit-base-patch32"
+
+            model = CLIPTextModelWithProjection.from_pretrained(model_name)
+            model.eval()
+
+            _clip_tokenizer = CLIPTokenizerFast.from_pretrained(model_name)
+            _clip_model = model
+
+    return _clip_model, _clip_tokenizer
+
+
+def embed_segment_texts(
+    segments: List[Dict[str, Any]],
+    batch_size: int = 64,
+):
+    """
+    Embeds every segment text with the CLIP text encoder, in batches.
+    Returns an L2-normalized float16 matrix with one row per segment.
+    """
+
+    import numpy as np
+    import torch
+
+    model, tokenizer = get_clip_text_model_and_tokenizer()
+
+    texts = [segment.get("text", "") for segment in segments]
+    batches = []
+
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            texts[start:start + batch_size],
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+        )
+
+        with torch.no_grad():
+            text_features = model(
+                input_ids=inputs.input_ids,
+                attention_mask=inputs.attention_mask,
+            ).text_embeds
+
+        batches.append(text_features.detach().cpu().numpy().astype("float32"))
+
+    matrix = np.concatenate(batches, axis=0)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+
+    return (matrix / norms).astype("float16")
+
+
+def upload_transcript_embeddings_to_azure(
+    job_id: str,
+    segments: List[Dict[str, Any]],
+) -> str:
+    """
+    Uploads the segment embedding matrix as <job_id>.embeddings.npy.
+    Returns blob_name.
+    """
+
+    import io
+
+    import numpy as np
+    from azure.storage.blob import ContentSettings
+
+    matrix = embed_segment_texts(segments)
+
+    buffer = io.BytesIO()
+    np.save(buffer, matrix, allow_pickle=False)
+
+    container_client = get_transcripts_container_client()
+
+    blob_name = f"{job_id}.embeddings.npy"
+    blob_client = container_client.get_blob_client(blob_name)
+
+    blob_client.upload_blob(
+        buffer.getvalue(),
+        overwrite=True,
+        content_settings=ContentSettings(content_type="application/octet-stream"),
+    )
+
+    return blob_name
+
+
 @app.function(
     image=image,
     timeout=60 * 60,
@@ -427,7 +632,7 @@ def process_youtube_video_background(
                 audio_status="transcribing",
             )
 
-            segments = transcribe_with_groq(audio_path)
+            segments, words = transcribe_with_groq(audio_path)
 
             transcript_data = {
                 "job_id": job_id,
@@ -439,6 +644,7 @@ def process_youtube_video_background(
                 "video_title": video_title,
                 "created_at": now_iso(),
                 "segments": segments,
+                "words": words,
             }
 
             update_parent_job(
@@ -458,6 +664,26 @@ def process_youtube_video_background(
                 transcript_data=transcript_data,
             )
 
+            upload_binary_transcript_to_azure(
+                job_id=job_id,
+                transcript_data=transcript_data,
+            )
+
+            upload_transcript_index_to_azure(
+                job_id=job_id,
+                segments=segments,
+                words=words,
+            )
+
+            try:
+                upload_transcript_embeddings_to_azure(
+                    job_id=job_id,
+                    segments=segments,
+                )
+            except Exception as embedding_error:
+                # Keyword search still works without embeddings.
+                print(f"[embeddings] Could not embed transcript: {embedding_error}")
+
         update_audio_job(
             job_id=job_id,
             audio_status="ready",
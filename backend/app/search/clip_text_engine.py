@@ -0,0 +1,298 @@
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import torch
+from transformers import CLIPTextModelWithProjection, CLIPTokenizerFast
+
+
+# Engines for the CLIP text tower on CPU:
+#
+#   torch       eager PyTorch float32 (reference)
+#   torch-int8  PyTorch dynamic int8 quantization of the Linear layers
+#   onnx        exported ONNX graph run by onnxruntime
+#   onnx-int8   the ONNX graph with onnxruntime dynamic int8 quantization
+#
+# onnxruntime is optional; it is only imported for the onnx engines.
+TEXT_ENGINES = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+
+# Short, varied queries used to compare an engine against torch float32.
+PARITY_QUERIES = [
+    "explosion",
+    "car chase at night",
+    "a man talking to the camera",
+    "two people shaking hands in an office",
+    "sunset over the ocean",
+    "crowd cheering in a stadium",
+    "close up of a cat",
+    "someone typing on a laptop keyboard",
+]
+
+
+class TorchTextEngine:
+    def __init__(self, model, tokenizer, name: str = "torch"):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.name = name
+
+    def embed(self, queries: List[str]) -> np.ndarray:
+        inputs = self.tokenizer(
+            queries,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+        )
+
+        with torch.no_grad():
+            text_features = self.model(
+                input_ids=inputs.input_ids,
+                attention_mask=inputs.attention_mask,
+            ).text_embeds
+
+        return text_features.detach().cpu().numpy()
+
+
+class OnnxTextEngine:
+    def __init__(self, onnx_path: str, tokenizer, name: str = "onnx"):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = onnxruntime.InferenceSession(
+            onnx_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.tokenizer = tokenizer
+        self.name = name
+
+    def embed(self, queries: List[str]) -> np.ndarray:
+        inputs = self.tokenizer(
+            queries,
+            return_tensors="np",
+            padding=True,
+            truncation=True,
+        )
+
+        (text_features,) = self.session.run(
+            ["text_embeds"],
+            {
+                "input_ids": inputs["input_ids"].astype("int64"),
+                "attention_mask": inputs["attention_mask"].astype("int64"),
+            },
+        )
+
+        return text_features
+
+
+class TextEmbedsOnly(torch.nn.Module):
+    """
+    Wraps the text model so the exported graph has a single tensor output.
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+        ).text_embeds
+
+
+def export_text_model_to_onnx(model, tokenizer, onnx_path: str) -> None:
+    inputs = tokenizer(
+        ["export"],
+        return_tensors="pt",
+        padding=True,
+        truncation=True,
+    )
+
+    torch.onnx.export(
+        TextEmbedsOnly(model),
+        (inputs.input_ids, inputs.attention_mask),
+        onnx_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["text_embeds"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "text_embeds": {0: "batch"},
+        },
+        opset_version=17,
+    )
+
+
+def write_file_atomically(path: str, write) -> None:
+    """
+    Calls write(temp_path) on a temporary path in the same directory and
+    moves the result into place with os.replace. Other processes see
+    either no file or a complete one, never a half-written model.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    root, extension = os.path.splitext(os.path.basename(path))
+    temp_path = os.path.join(directory, f".{root}.{os.getpid()}.tmp{extension}")
+
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_onnx_model_path(model, tokenizer, onnx_path: str, quantized: bool) -> str:
+    """
+    Exports (and optionally quantizes) the ONNX graph on first use and
+    reuses the files afterwards. Files are written atomically, so workers
+    starting together may each export, but none loads a partial file.
+    """
+
+    if not os.path.exists(onnx_path):
+        print(f"[CLIP] Exporting CLIP text model to {onnx_path}...")
+        write_file_atomically(
+            onnx_path,
+            lambda temp_path: export_text_model_to_onnx(model, tokenizer, temp_path),
+        )
+
+    if not quantized:
+        return onnx_path
+
+    root, extension = os.path.splitext(onnx_path)
+    quantized_path = f"{root}.int8{extension}"
+
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print(f"[CLIP] Quantizing ONNX text model to {quantized_path}...")
+        write_file_atomically(
+            quantized_path,
+            lambda temp_path: quantize_dynamic(
+                onnx_path, temp_path, weight_type=QuantType.QInt8
+            ),
+        )
+
+    return quantized_path
+
+
+def build_text_engine(engine_name: str, model, tokenizer, onnx_path: str):
+    if engine_name == "torch":
+        return TorchTextEngine(model, tokenizer)
+
+    if engine_name == "torch-int8":
+        quantized_model = torch.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+        return TorchTextEngine(quantized_model, tokenizer, name="torch-int8")
+
+    if engine_name in {"onnx", "onnx-int8"}:
+        quantized = engine_name == "onnx-int8"
+        path = get_onnx_model_path(model, tokenizer, onnx_path, quantized)
+        return OnnxTextEngine(path, tokenizer, name=engine_name)
+
+    raise ValueError(
+        f"Unknown CLIP text engine: {engine_name}. Use one of {', '.join(TEXT_ENGINES)}."
+    )
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype="float32")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+
+    return matrix / norms
+
+
+def check_engine_parity(
+    engine,
+    reference_engine,
+    queries: List[str] = PARITY_QUERIES,
+    threshold: float = 0.99,
+) -> Dict[str, Any]:
+    """
+    Cosine similarity between each query's vector from engine and from the
+    float32 reference. The engine passes when the worst query clears
+    threshold.
+    """
+
+    similarities = np.sum(
+        normalize_rows(engine.embed(queries)) * normalize_rows(reference_engine.embed(queries)),
+        axis=1,
+    )
+
+    return {
+        "engine": engine.name,
+        "min_cosine": round(float(similarities.min()), 5),
+        "mean_cosine": round(float(similarities.mean()), 5),
+        "threshold": threshold,
+        "passed": bool(similarities.min() >= threshold),
+    }
+
+
+def benchmark_engine(
+    engine,
+    queries: List[str] = PARITY_QUERIES,
+    repeats: int = 20,
+) -> Dict[str, Any]:
+    """
+    Single-query latency over repeats passes of queries, after one warmup.
+    """
+
+    engine.embed(queries[:1])
+
+    timings = []
+
+    for _ in range(repeats):
+        for query in queries:
+            started = time.perf_counter()
+            engine.embed([query])
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings_array = np.array(timings)
+
+    return {
+        "engine": engine.name,
+        "runs": len(timings),
+        "p50_ms": round(float(np.percentile(timings_array, 50)), 2),
+        "p95_ms": round(float(np.percentile(timings_array, 95)), 2),
+        "mean_ms": round(float(timings_array.mean()), 2),
+    }
+
+
+def main() -> None:
+    from app.config import settings
+    from app.search.visual_search import CLIP_MODEL_NAME
+
+    parser = argparse.ArgumentParser(
+        description="Compare CLIP text engines against torch float32 for parity and latency.",
+    )
+    parser.add_argument("--engines", nargs="+", default=list(TEXT_ENGINES), choices=TEXT_ENGINES)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=settings.CLIP_ENGINE_PARITY_THRESHOLD)
+    parser.add_argument("--onnx-path", default=settings.CLIP_ONNX_PATH)
+    args = parser.parse_args()
+
+    model = CLIPTextModelWithProjection.from_pretrained(CLIP_MODEL_NAME).eval()
+    tokenizer = CLIPTokenizerFast.from_pretrained(CLIP_MODEL_NAME)
+
+    reference = TorchTextEngine(model, tokenizer)
+
+    for engine_name in args.engines:
+        engine = build_text_engine(engine_name, model, tokenizer, args.onnx_path)
+
+        print(check_engine_parity(engine, reference, threshold=args.threshold))
+        print(benchmark_engine(engine, repeats=args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+
+# Bump this whenever the index layout or the tokenizer changes.
+# The backend rebuilds the index in-process when a stored index
+# has a different version, so old jobs keep working.
+DIALOGUE_INDEX_VERSION = 4
+
+
+# How far ahead in the Whisper word list a transcript word is looked for
+# when lining the two up; small gaps come from punctuation-only "words".
+WORD_ALIGN_LOOKAHEAD = 8
+
+
+STOP_WORDS = {
+    "the", "a", "an", "and", "or", "but",
+    "is", "are", "am", "was", "were",
+    "to", "of", "in", "on", "at", "for", "with",
+    "this", "that", "these", "those",
+    "i", "you", "he", "she", "it", "we", "they",
+}
+
+
+def normalize_text(text: str) -> str:
+    text = text.lower()
+    text = text.replace("’", "'").replace("`", "'")
+
+    text = re.sub(r"\bi'm\b", "i am", text)
+    text = re.sub(r"\bim\b", "i am", text)
+
+    text = re.sub(r"\byou're\b", "you are", text)
+    text = re.sub(r"\bwe're\b", "we are", text)
+    text = re.sub(r"\bthey're\b", "they are", text)
+    text = re.sub(r"\bhe's\b", "he is", text)
+    text = re.sub(r"\bshe's\b", "she is", text)
+    text = re.sub(r"\bit's\b", "it is", text)
+
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+
+    return text
+
+
+def filter_important_words(words: List[str]) -> List[str]:
+    return [
+        word for word in words
+        if word not in STOP_WORDS and len(word) > 1
+    ]
+
+
+def tokenize_normalized(normalized: str) -> List[str]:
+    return filter_important_words(normalized.split())
+
+
+def tokenize(text: str) -> List[str]:
+    return tokenize_normalized(normalize_text(text))
+
+
+def tokenize_with_spans(text: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Same words as normalize_text(text).split(), each paired with the
+    character span of the original whitespace-separated chunk it came from
+    (minus surrounding punctuation), so matches can be highlighted in the
+    raw segment text.
+    """
+
+    words: List[str] = []
+    spans: List[Tuple[int, int]] = []
+
+    for chunk in re.finditer(r"\S+", text):
+        chunk_words = normalize_text(chunk.group()).split()
+
+        if not chunk_words:
+            continue
+
+        core = re.search(r"[A-Za-z0-9].*[A-Za-z0-9]|[A-Za-z0-9]", chunk.group())
+        span_start = chunk.start() + (core.start() if core else 0)
+        span_end = chunk.start() + (core.end() if core else len(chunk.group()))
+
+        for word in chunk_words:
+            words.append(word)
+            spans.append((span_start, span_end))
+
+    return words, spans
+
+
+def align_word_times(
+    segments: List[Dict[str, Any]],
+    segment_offsets: List[int],
+    stream_words: List[str],
+    words: Dict[str, List[Any]],
+) -> List[float]:
+    """
+    Gives every stream word the start time of the Whisper word it came from.
+
+    Whisper words and segment texts come from the same decoding, so they
+    are walked side by side: each stream word is matched to the next equal
+    normalized Whisper word within WORD_ALIGN_LOOKAHEAD. Unmatched stream
+    words fall back to their segment start.
+    """
+
+    word_starts: List[Tuple[str, float]] = []
+
+    for text, start in zip(words.get("text", []), words.get("start", [])):
+        for word in normalize_text(text or "").split():
+            word_starts.append((word, float(start)))
+
+    times: List[float] = []
+    next_word = 0
+
+    for position, segment in enumerate(segments):
+        segment_start = round(float(segment.get("start", 0)), 2)
+
+        for stream_position in range(segment_offsets[position], segment_offsets[position + 1]):
+            stream_word = stream_words[stream_position]
+            time = segment_start
+
+            for candidate in range(next_word, min(next_word + WORD_ALIGN_LOOKAHEAD, len(word_starts))):
+                if word_starts[candidate][0] == stream_word:
+                    time = round(word_starts[candidate][1], 2)
+                    next_word = candidate + 1
+                    break
+
+            times.append(time)
+
+    return times
+
+
+def build_dialogue_index(
+    segments: List[Dict[str, Any]],
+    words: Dict[str, List[Any]] | None = None,
+) -> Dict[str, Any]:
+    """
+    Builds the dialogue search index over transcript segments.
+
+    Two views of the same text are stored:
+
+    - Segment postings: token -> sorted segment positions (not Whisper
+      segment ids) with a parallel list of term frequencies, plus the
+      per-segment token counts. This is everything BM25 needs.
+    - A positional index over the whole transcript as one word stream
+      (stop words included): word -> sorted stream positions, the stream
+      offset where each segment starts, and the character span of every
+      stream word in its segment text. Phrase and proximity matches can
+      cross segment boundaries and be highlighted from these arrays alone.
+
+    With Whisper word timings (the transcript's "words" columns), every
+    stream word also gets its own start time in token_times, so a match can
+    seek to the first matched word instead of the segment start.
+
+    This module has no third-party imports on purpose: the Modal audio
+    worker builds the index at transcription time with the same tokenizer
+    the backend uses at query time.
+    """
+
+    segment_lengths: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    term_frequencies: Dict[str, List[int]] = {}
+
+    segment_offsets: List[int] = []
+    positions: Dict[str, List[int]] = {}
+    token_spans: List[int] = []
+    stream_words: List[str] = []
+    stream_length = 0
+
+    for position, segment in enumerate(segments):
+        segment_words, spans = tokenize_with_spans(segment.get("text", ""))
+
+        segment_offsets.append(stream_length)
+
+        for word, (span_start, span_end) in zip(segment_words, spans):
+            positions.setdefault(word, []).append(stream_length)
+            token_spans.append(span_start)
+            token_spans.append(span_end)
+            stream_words.append(word)
+            stream_length += 1
+
+        tokens = filter_important_words(segment_words)
+        segment_lengths.append(len(tokens))
+
+        for token, frequency in Counter(tokens).items():
+            postings.setdefault(token, []).append(position)
+            term_frequencies.setdefault(token, []).append(frequency)
+
+    segment_offsets.append(stream_length)
+
+    token_times = None
+
+    if words and len(words.get("start", [])):
+        token_times = align_word_times(segments, segment_offsets, stream_words, words)
+
+    average_segment_length = (
+        sum(segment_lengths) / len(segment_lengths)
+        if segment_lengths
+        else 0.0
+    )
+
+    return {
+        "version": DIALOGUE_INDEX_VERSION,
+        "segment_count": len(segments),
+        "segment_lengths": segment_lengths,
+        "average_segment_length": average_segment_length,
+        "postings": postings,
+        "term_frequencies": term_frequencies,
+        "segment_offsets": segment_offsets,
+        "positions": positions,
+        "token_spans": token_spans,
+        "token_times": token_times,
+    }
+
+
+def is_usable_dialogue_index(
+    index: Dict[str, Any] | None,
+    segment_count: int | None = None,
+) -> bool:
+    """
+    segment_count can be left out when the transcript itself has not been
+    loaded yet; callers must then check it before reading segments.
+    """
+
+    if not index:
+        return False
+
+    if index.get("version") != DIALOGUE_INDEX_VERSION:
+        return False
+
+    return segment_count is None or index.get("segment_count") == segment_count
+
+
+def merge_dialogue_indexes(indexes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Concatenates several transcripts' dialogue indexes into one index of
+    the same layout, for library search over a shard of jobs.
+
+    Segments and stream words are renumbered in order, so the merged
+    postings and positions stay sorted. BM25 statistics then cover the
+    whole shard. Two lists record where each transcript starts:
+
+    - document_offsets: stream offset of each transcript, plus the end.
+    - document_segment_offsets: segment offset of each transcript, plus
+      the total segment count.
+
+    Phrase and proximity matching use document_offsets to never match
+    across two transcripts. token_times is None when no transcript has word
+    timings, and holds None for the words of transcripts without them.
+    """
+
+    segment_lengths: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    term_frequencies: Dict[str, List[int]] = {}
+
+    segment_offsets: List[int] = []
+    positions: Dict[str, List[int]] = {}
+    token_spans: List[int] = []
+    token_times: List[Any] = []
+    has_token_times = False
+
+    document_offsets: List[int] = []
+    document_segment_offsets: List[int] = []
+
+    for index in indexes:
+        segment_base = len(segment_lengths)
+        stream_base = len(token_spans) // 2
+        stream_length = index["segment_offsets"][-1]
+
+        document_offsets.append(stream_base)
+        document_segment_offsets.append(segment_base)
+
+        segment_lengths.extend(index["segment_lengths"])
+
+        for token, token_postings in index["postings"].items():
+            postings.setdefault(token, []).extend(
+                segment_base + position for position in token_postings
+            )
+            term_frequencies.setdefault(token, []).extend(index["term_frequencies"][token])
+
+        segment_offsets.extend(
+            stream_base + offset for offset in index["segment_offsets"][:-1]
+        )
+
+        for word, word_positions in index["positions"].items():
+            positions.setdefault(word, []).extend(
+                stream_base + position for position in word_positions
+            )
+
+        token_spans.extend(index["token_spans"])
+
+        if index.get("token_times"):
+            has_token_times = True
+            token_times.extend(index["token_times"])
+        else:
+            token_times.extend([None] * stream_length)
+
+    total_stream_length = len(token_spans) // 2
+
+    segment_offsets.append(total_stream_length)
+    document_offsets.append(total_stream_length)
+    document_segment_offsets.append(len(segment_lengths))
+
+    average_segment_length = (
+        sum(segment_lengths) / len(segment_lengths)
+        if segment_lengths
+        else 0.0
+    )
+
+    return {
+        "version": DIALOGUE_INDEX_VERSION,
+        "segment_count": len(segment_lengths),
+        "segment_lengths": segment_lengths,
+        "average_segment_length": average_segment_length,
+        "postings": postings,
+        "term_frequencies": term_frequencies,
+        "segment_offsets": segment_offsets,
+        "positions": positions,
+        "token_spans": token_spans,
+        "token_times": token_times if has_token_times else None,
+        "document_offsets": document_offsets,
+        "document_segment_offsets": document_segment_offsets,
+    }
@@ -0,0 +1,361 @@
+import bisect
+import heapq
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.azure_utils import (
+    get_transcript_search_state,
+    load_transcript,
+    load_transcript_index,
+)
+from app.config import settings
+from app.search.dialogue_index import (
+    build_dialogue_index,
+    is_usable_dialogue_index,
+    merge_dialogue_indexes,
+)
+from app.search.dialogue_search import (
+    build_result_with_context,
+    collect_highlights,
+    find_match_time,
+    get_search_structure,
+    rank_segments,
+)
+
+
+# Shards are ranked in parallel on this pool, shared by all library
+# searches so a burst of them cannot start a pool each.
+_library_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.LIBRARY_SEARCH_WORKERS),
+    thread_name_prefix="library-search",
+)
+
+
+def get_job_dialogue_index(blob_name: str) -> Dict[str, Any]:
+    """
+    Returns the dialogue index for one job without loading its transcript,
+    unless the job predates the current index version.
+    """
+
+    transcript_index = load_transcript_index(blob_name)
+
+    if is_usable_dialogue_index(transcript_index):
+        return transcript_index
+
+    transcript_data = load_transcript(blob_name)
+
+    return get_search_structure(
+        get_transcript_search_state(blob_name),
+        "dialogue_index",
+        lambda: build_dialogue_index(
+            transcript_data.get("segments", []),
+            transcript_data.get("words"),
+        ),
+    )
+
+
+def split_into_shards(jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Cuts the job list into shards of about LIBRARY_SEARCH_SHARD_SIZE jobs.
+
+    A shard ends after a job whose id hashes to 0 modulo the shard size, or
+    at twice the shard size. Boundaries therefore depend on the jobs, not on
+    their positions: a newly ready or removed job only changes the shard it
+    falls in, and every other shard keeps its cached index.
+    """
+
+    shard_size = max(1, settings.LIBRARY_SEARCH_SHARD_SIZE)
+    shards: List[List[Dict[str, Any]]] = []
+    shard: List[Dict[str, Any]] = []
+
+    for job in jobs:
+        shard.append(job)
+
+        if (
+            zlib.crc32(job["id"].encode("utf-8")) % shard_size == 0
+            or len(shard) >= 2 * shard_size
+        ):
+            shards.append(shard)
+            shard = []
+
+    if shard:
+        shards.append(shard)
+
+    return shards
+
+
+def get_shard_key(shard: List[Dict[str, Any]]) -> tuple:
+    return tuple(
+        (job["id"], job["transcript_blob_name"], job.get("transcript_updated_at"))
+        for job in shard
+    )
+
+
+def build_shard_index(shard: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges the dialogue indexes of a shard's jobs into one index. Returns
+    the index, the ids of the jobs it holds, in order, and whether every
+    job made it in.
+    """
+
+    indexes = []
+    job_ids = []
+
+    for job in shard:
+        try:
+            indexes.append(get_job_dialogue_index(job["transcript_blob_name"]))
+        except Exception as error:
+            # One broken job should not fail a library-wide search.
+            print(f"[Library search] Skipping job {job['id']}: {error}")
+            continue
+
+        job_ids.append(job["id"])
+
+    return {
+        "index": merge_dialogue_indexes(indexes),
+        "job_ids": job_ids,
+        "complete": len(job_ids) == len(shard),
+    }
+
+
+class ShardIndexCache:
+    """
+    Count-bounded LRU cache of merged shard indexes.
+
+    Keys list the shard's jobs with their transcript blob and its
+    updated_at, so a newly ready or rewritten transcript changes its
+    shard's key and the stale index is never served; it just ages out.
+    Shards with a job that failed to load are not cached, so the job is
+    retried on the next search.
+
+    Building is single-flight per shard, like BlobCache loading.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        build: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+    ):
+        self.max_entries = max_entries
+        self.build = build
+
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._building: Dict[tuple, threading.Event] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, shard: List[Dict[str, Any]]) -> Dict[str, Any]:
+        key = get_shard_key(shard)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+
+                building = self._building.get(key)
+
+                if building is None:
+                    building = threading.Event()
+                    self._building[key] = building
+                    self.misses += 1
+                    break
+
+            # Another search is building this shard; use its result.
+            building.wait()
+
+        try:
+            entry = self.build(shard)
+            entry["key"] = key
+
+            if entry["complete"] and self.max_entries > 0:
+                with self._lock:
+                    self._entries[key] = entry
+
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+            return entry
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+
+            building.set()
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_shard_cache = ShardIndexCache(
+    max_entries=settings.LIBRARY_SHARD_CACHE_SIZE,
+    build=build_shard_index,
+)
+
+
+def get_library_shard_cache_stats() -> Dict[str, Any]:
+    return _shard_cache.stats()
+
+
+def search_shard(
+    shard: List[Dict[str, Any]],
+    library_order: Dict[str, int],
+    query: str,
+    max_results: int,
+) -> List[Tuple[Tuple[float, int, int], Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+    """
+    Ranks one shard through its merged index and returns its own top
+    max_results, best first, as (sort key, job, match, shard entry). The
+    match keeps the merged index's segment and stream positions.
+
+    The sort key is unique per job and segment, so heap comparisons never
+    fall through to the dicts.
+    """
+
+    entry = _shard_cache.get(shard)
+    document_segment_offsets = entry["index"]["document_segment_offsets"]
+    jobs_by_id = {job["id"]: job for job in shard}
+
+    items = []
+
+    for match in rank_segments(entry["index"], query, max_results):
+        slot = bisect.bisect_right(document_segment_offsets, match["segment"]) - 1
+        job = jobs_by_id[entry["job_ids"][slot]]
+        local_segment = match["segment"] - document_segment_offsets[slot]
+
+        items.append((
+            (match["score"], -library_order[job["id"]], -local_segment),
+            job,
+            match,
+            entry,
+        ))
+
+    return sorted(items, key=lambda item: item[0], reverse=True)
+
+
+def build_library_result(
+    job: Dict[str, Any],
+    match: Dict[str, Any],
+    entry: Dict[str, Any],
+    context_lines: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Builds the result for one shard match from the job's transcript, in
+    the job's own segment numbering. Returns None when the transcript can
+    not be loaded or no longer matches the shard index.
+    """
+
+    shard_index = entry["index"]
+    document_segment_offsets = shard_index["document_segment_offsets"]
+    slot = bisect.bisect_right(document_segment_offsets, match["segment"]) - 1
+    segment_base = document_segment_offsets[slot]
+
+    try:
+        transcript_data = load_transcript(job["transcript_blob_name"])
+    except Exception as error:
+        print(f"[Library search] Skipping job {job['id']}: {error}")
+        return None
+
+    segment_count = document_segment_offsets[slot + 1] - segment_base
+
+    if len(transcript_data.get("segments", [])) != segment_count:
+        # The transcript changed after the shard was built.
+        print(f"[Library search] Shard index is stale for job {job['id']}; rebuilding it next time.")
+        _shard_cache.invalidate(entry["key"])
+        return None
+
+    highlights = {
+        segment - segment_base: spans
+        for segment, spans in collect_highlights(
+            shard_index, match["matched_positions"]
+        ).items()
+    }
+
+    result = build_result_with_context(
+        transcript_data=transcript_data,
+        position=match["segment"] - segment_base,
+        score=match["score"],
+        match_type=match["match_type"],
+        highlights=highlights,
+        context_lines=context_lines,
+        seek_time=find_match_time(
+            shard_index, match["segment"], match["matched_positions"]
+        ),
+    )
+
+    result["job_id"] = job["id"]
+    result["video_title"] = job.get("video_title") or job.get("original_file_name")
+
+    return result
+
+
+def search_dialogue_library(
+    jobs: List[Dict[str, Any]],
+    query: str,
+    max_results: int = 10,
+    context_lines: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Searches many transcripts at once.
+
+    Jobs are split into shards (see split_into_shards), and each shard is
+    searched through one merged index of its jobs' dialogue indexes (see
+    merge_dialogue_indexes). Merged indexes are cached per shard, so a
+    query costs one ranking pass per shard rather than one index load and
+    ranking pass per job. Shards are ranked in parallel, each returning its
+    own top max_results, and the sorted shard lists are heap-merged. Full
+    transcripts are loaded only for the matches that make the final
+    results, through the bounded transcript cache.
+
+    A match whose transcript fails to load or no longer fits the shard
+    index is skipped, and the next merged match takes its place.
+
+    Fuzzy matching is left out here: its deletion index is per transcript
+    and not worth building for every job in the library on one query.
+    """
+
+    if not query.strip() or not jobs:
+        return []
+
+    library_order = {job["id"]: order for order, job in enumerate(jobs)}
+
+    shard_results = list(_library_executor.map(
+        lambda shard: search_shard(shard, library_order, query, max_results),
+        split_into_shards(jobs),
+    ))
+
+    merged = heapq.merge(
+        *shard_results,
+        key=lambda item: item[0],
+        reverse=True,
+    )
+
+    results = []
+
+    for _, job, match, entry in merged:
+        if len(results) >= max_results:
+            break
+
+        result = build_library_result(job, match, entry, context_lines)
+
+        if result is not None:
+            results.append(result)
+
+    return results
@@ -1,16 +1,34 @@
-import re
-from typing import Any, Dict, List
-
+import bisect
+import heapq
+import math
+from collections import Counter, deque
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from app.search.dialogue_index import (
+    build_dialogue_index,
+    is_usable_dialogue_index,
+    normalize_text,
+    tokenize,
+    tokenize_normalized,
+)
 from app.youtube_utils import build_youtube_timestamp_url
 
 
-STOP_WORDS = {
-    "the", "a", "an", "and", "or", "but",
-    "is", "are", "am", "was", "were",
-    "to", "of", "in", "on", "at", "for", "with",
-    "this", "that", "these", "those",
-    "i", "you", "he", "she", "it", "we", "they",
-}
+# Standard Okapi BM25 parameters; short Whisper segments do not need tuning.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Extra words allowed between query keywords for a proximity match.
+PROXIMITY_SLOP = 6
+
+# Typo tolerance for query keywords missing from the transcript.
+FUZZY_MAX_EDIT_DISTANCE = 2
+FUZZY_PREFIX_LENGTH = 7
+FUZZY_MAX_CANDIDATES = 5
+FUZZY_DISTANCE_PENALTY = 0.25
 
 
 def format_timestamp(seconds: float) -> str:
@@ -26,38 +44,6 @@ def format_timestamp(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
-def normalize_text(text: str) -> str:
-    text = text.lower()
-    text = text.replace("’", "'").replace("`", "'")
-
-    text = re.sub(r"\bi'm\b", "i am", text)
-    text = re.sub(r"\bim\b", "i am", text)
-
-    text = re.sub(r"\byou're\b", "you are", text)
-    text = re.sub(r"\bwe're\b", "we are", text)
-    text = re.sub(r"\bthey're\b", "they are", text)
-    text = re.sub(r"\bhe's\b", "he is", text)
-    text = re.sub(r"\bshe's\b", "she is", text)
-    text = re.sub(r"\bit's\b", "it is", text)
-
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    return text
-
-
-def tokenize(text: str) -> List[str]:
-    normalized = normalize_text(text)
-    words = normalized.split()
-
-    important_words = [
-        word for word in words
-        if word not in STOP_WORDS and len(word) > 1
-    ]
-
-    return important_words
-
-
 def calculate_match_score(query: str, segment_text: str) -> float:
     normalized_query = normalize_text(query)
     normalized_segment = normalize_text(segment_text)
@@ -87,52 +73,779 @@ def calculate_match_score(query: str, segment_text: str) -> float:
     return word_match_ratio
 
 
-def search_dialogue_in_transcript(
-    transcript_data: Dict[str, Any],
+def get_search_structure(
+    search_state: Dict[str, Any] | None,
+    key: str,
+    build: Callable[[], Any],
+) -> Any:
+    """
+    Returns a structure derived from one transcript, building it only once
+    per cached transcript (see get_transcript_search_state in azure_utils).
+    """
+
+    if search_state is None:
+        return build()
+
+    value = search_state.get(key)
+
+    if value is None:
+        value = build()
+        search_state[key] = value
+
+    return value
+
+
+def bm25_idf(document_frequency: int, segment_count: int) -> float:
+    return math.log(
+        1 + (segment_count - document_frequency + 0.5) / (document_frequency + 0.5)
+    )
+
+
+def parse_dialogue_query(query: str) -> Tuple[str, bool]:
+    """
+    A query wrapped in double quotes only returns exact phrase matches.
+    """
+
+    clean_query = query.strip()
+
+    if len(clean_query) >= 2 and clean_query[0] == '"' and clean_query[-1] == '"':
+        return clean_query[1:-1].strip(), True
+
+    return clean_query, False
+
+
+def contains_sorted(values: List[int], target: int) -> bool:
+    index = bisect.bisect_left(values, target)
+    return index < len(values) and values[index] == target
+
+
+def segment_at(transcript_index: Dict[str, Any], stream_position: int) -> int:
+    return bisect.bisect_right(transcript_index["segment_offsets"], stream_position) - 1
+
+
+def crosses_documents(transcript_index: Dict[str, Any], first: int, last: int) -> bool:
+    """
+    True when stream positions first and last belong to different
+    transcripts of a merged library index (see merge_dialogue_indexes).
+    """
+
+    document_offsets = transcript_index.get("document_offsets")
+
+    if not document_offsets:
+        return False
+
+    return (
+        bisect.bisect_right(document_offsets, first)
+        != bisect.bisect_right(document_offsets, last)
+    )
+
+
+def find_phrase_matches(
+    transcript_index: Dict[str, Any],
+    words: List[str],
+) -> List[int]:
+    """
+    Returns the stream positions where words occur consecutively.
+
+    Candidates come from the rarest word's positions; every other word is
+    checked with a binary search in its own positions list. Matches can
+    span segment boundaries.
+    """
+
+    positions = transcript_index["positions"]
+    word_positions = [positions.get(word) for word in words]
+
+    if not words or any(not values for values in word_positions):
+        return []
+
+    anchor = min(range(len(words)), key=lambda offset: len(word_positions[offset]))
+
+    matches = []
+
+    for anchor_position in word_positions[anchor]:
+        start = anchor_position - anchor
+
+        if start < 0:
+            continue
+
+        if all(
+            contains_sorted(values, start + offset)
+            for offset, values in enumerate(word_positions)
+            if offset != anchor
+        ):
+            matches.append(start)
+
+    return matches
+
+
+def find_proximity_windows(
+    term_positions: List[List[int]],
+    max_span: int,
+) -> List[Tuple[int, int]]:
+    """
+    Returns minimal (first, last) stream position windows that contain one
+    position from every list at most max_span words apart, in any order.
+
+    One linear pass over the merged positions of the query terms.
+    """
+
+    if len(term_positions) < 2 or any(not values for values in term_positions):
+        return []
+
+    merged = heapq.merge(*(
+        zip(values, repeat(term_id))
+        for term_id, values in enumerate(term_positions)
+    ))
+
+    window: deque = deque()
+    counts = [0] * len(term_positions)
+    covered = 0
+    windows = []
+
+    for position, term_id in merged:
+        window.append((position, term_id))
+
+        if counts[term_id] == 0:
+            covered += 1
+        counts[term_id] += 1
+
+        while window and counts[window[0][1]] > 1:
+            counts[window[0][1]] -= 1
+            window.popleft()
+
+        if covered == len(term_positions):
+            first = window[0][0]
+
+            if position - first + 1 <= max_span:
+                windows.append((first, position))
+
+            _, first_term = window.popleft()
+            counts[first_term] -= 1
+            covered -= 1
+
+    return windows
+
+
+def find_term_positions(
+    transcript_index: Dict[str, Any],
+    terms: List[str],
+    first: int,
+    last: int,
+) -> List[int]:
+    positions = transcript_index["positions"]
+    found = []
+
+    for term in set(terms):
+        values = positions.get(term, [])
+        start = bisect.bisect_left(values, first)
+        end = bisect.bisect_right(values, last)
+        found.extend(values[start:end])
+
+    return sorted(found)
+
+
+def max_edit_distance_for(word: str) -> int:
+    """
+    Short words get no typo tolerance; they collide with too many others.
+    """
+
+    if len(word) <= 3:
+        return 0
+
+    if len(word) <= 5:
+        return 1
+
+    return FUZZY_MAX_EDIT_DISTANCE
+
+
+def generate_deletes(word: str, max_distance: int) -> set:
+    deletes = {word}
+    frontier = {word}
+
+    for _ in range(max_distance):
+        next_frontier = set()
+
+        for current in frontier:
+            for index in range(len(current)):
+                next_frontier.add(current[:index] + current[index + 1:])
+
+        deletes |= next_frontier
+        frontier = next_frontier
+
+    return deletes
+
+
+def bounded_edit_distance(source: str, target: str, max_distance: int) -> int:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance, giving up as
+    soon as it must exceed max_distance. Returns max_distance + 1 then.
+    """
+
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(target) + 1))
+
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        row_minimum = current[0]
+
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+
+            if (
+                i > 1 and j > 1
+                and source[i - 1] == target[j - 2]
+                and source[i - 2] == target[j - 1]
+            ):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+
+            row_minimum = min(row_minimum, current[j])
+
+        if row_minimum > max_distance:
+            return max_distance + 1
+
+        previous_previous, previous = previous, current
+
+    return min(previous[-1], max_distance + 1)
+
+
+def build_fuzzy_index(vocabulary) -> Dict[str, List[str]]:
+    """
+    SymSpell-style deletion index over the transcript vocabulary.
+
+    Every word is stored under each string reachable by deleting up to
+    FUZZY_MAX_EDIT_DISTANCE characters from its first FUZZY_PREFIX_LENGTH
+    characters. A query word then only needs its own deletes looked up, so
+    typo candidates are found by hashing rather than by comparing against
+    every word. The prefix cap keeps the index small for long words.
+    """
+
+    fuzzy_index: Dict[str, List[str]] = {}
+
+    for word in vocabulary:
+        prefix = word[:FUZZY_PREFIX_LENGTH]
+
+        for variant in generate_deletes(prefix, FUZZY_MAX_EDIT_DISTANCE):
+            fuzzy_index.setdefault(variant, []).append(word)
+
+    return fuzzy_index
+
+
+def find_fuzzy_matches(
+    fuzzy_index: Dict[str, List[str]],
+    word: str,
+) -> List[Tuple[str, int]]:
+    max_distance = max_edit_distance_for(word)
+
+    if max_distance == 0:
+        return []
+
+    candidates = set()
+
+    for variant in generate_deletes(word[:FUZZY_PREFIX_LENGTH], max_distance):
+        candidates.update(fuzzy_index.get(variant, ()))
+
+    matches = []
+
+    for candidate in candidates:
+        distance = bounded_edit_distance(word, candidate, max_distance)
+
+        if 0 < distance <= max_distance:
+            matches.append((candidate, distance))
+
+    matches.sort(key=lambda match: (match[1], match[0]))
+
+    return matches[:FUZZY_MAX_CANDIDATES]
+
+
+def expand_query_words(
+    transcript_index: Dict[str, Any],
+    query_words: List[str],
+    get_fuzzy_index: Callable[[], Dict[str, List[str]]] | None,
+) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Maps each distinct query word to the transcript words that can stand in
+    for it, with a weight. Words found in the transcript map to themselves;
+    missing words map to their closest typo matches when get_fuzzy_index is
+    given, and to nothing otherwise.
+
+    get_fuzzy_index is only called for a missing word long enough to get
+    typo tolerance, so the deletion index is never built for queries whose
+    words all occur in the transcript.
+    """
+
+    postings = transcript_index["postings"]
+    expansions: Dict[str, List[Tuple[str, float]]] = {}
+    fuzzy_index = None
+
+    for word in dict.fromkeys(query_words):
+        if word in postings:
+            expansions[word] = [(word, 1.0)]
+            continue
+
+        if get_fuzzy_index is None or max_edit_distance_for(word) == 0:
+            expansions[word] = []
+            continue
+
+        if fuzzy_index is None:
+            fuzzy_index = get_fuzzy_index()
+
+        expansions[word] = [
+            (candidate, 1.0 - FUZZY_DISTANCE_PENALTY * distance)
+            for candidate, distance in find_fuzzy_matches(fuzzy_index, word)
+        ]
+
+    return expansions
+
+
+def score_bm25_segments(
+    transcript_index: Dict[str, Any],
+    query_words: List[str],
+    expansions: Dict[str, List[Tuple[str, float]]],
+) -> Dict[int, float]:
+    """
+    Scores segments with BM25 over the postings of the query terms only,
+    so work is proportional to the number of postings the query touches.
+
+    expansions maps each query word to the transcript words that stand in
+    for it with a weight (1.0 for the word itself, less for typo matches).
+    A segment counts a query word as matched once, through its best
+    variant.
+
+    A segment needs at least half of the query words, as before. Scores are
+    relative to a segment of average length containing every query term
+    once, capped at 0.93 to stay below phrase and proximity matches.
+    """
+
+    postings = transcript_index["postings"]
+    term_frequencies = transcript_index["term_frequencies"]
+    segment_lengths = transcript_index["segment_lengths"]
+    average_segment_length = transcript_index["average_segment_length"] or 1.0
+    segment_count = transcript_index["segment_count"]
+
+    bm25_scores: Dict[int, float] = {}
+    matched_words: Counter = Counter()
+    ideal_score = 0.0
+
+    for word, query_count in Counter(query_words).items():
+        variants = expansions.get(word) or [(word, 1.0)]
+
+        ideal_score += bm25_idf(
+            len(postings.get(variants[0][0], ())),
+            segment_count,
+        ) * query_count
+
+        best_scores: Dict[int, float] = {}
+
+        for term, weight in variants:
+            term_postings = postings.get(term, ())
+            idf = bm25_idf(len(term_postings), segment_count) * weight
+
+            for position, frequency in zip(term_postings, term_frequencies.get(term, ())):
+                length_norm = 1 - BM25_B + BM25_B * (
+                    segment_lengths[position] / average_segment_length
+                )
+                term_score = idf * frequency * (BM25_K1 + 1) / (
+                    frequency + BM25_K1 * length_norm
+                )
+
+                if term_score > best_scores.get(position, 0.0):
+                    best_scores[position] = term_score
+
+        for position, term_score in best_scores.items():
+            bm25_scores[position] = (
+                bm25_scores.get(position, 0.0) + term_score * query_count
+            )
+            matched_words[position] += query_count
+
+    if not ideal_score:
+        return {}
+
+    min_matched_words = len(query_words) / 2
+
+    return {
+        position: min(bm25_score / ideal_score, 1.0) * 0.93
+        for position, bm25_score in bm25_scores.items()
+        if matched_words[position] >= min_matched_words
+    }
+
+
+def rank_segments(
+    transcript_index: Dict[str, Any],
     query: str,
-    max_results: int = 3,
+    max_results: int,
+    get_fuzzy_index: Callable[[], Dict[str, List[str]]] | None = None,
 ) -> List[Dict[str, Any]]:
-    clean_query = query.strip()
+    """
+    Ranks segments for a query from the index arrays alone.
+
+    - phrase: the whole normalized query occurs word for word, possibly
+      continuing into the next segment. Score 1.0.
+    - proximity: every query keyword occurs within a short window, possibly
+      across adjacent segments. Scores 0.93-0.98, tighter is better.
+    - keywords: BM25 over the segment postings. Scores up to 0.93.
+
+    With get_fuzzy_index, query keywords missing from the transcript also
+    match transcript words within a small edit distance, at a reduced
+    weight, in proximity and keyword matches. Phrase matches stay exact.
+
+    Each segment keeps its best match, and the top max_results are taken
+    with a bounded heap. Matches are returned as dicts with the segment
+    position, score, match type and the stream positions to highlight.
+    """
 
-    if not clean_query:
+    text, phrase_only = parse_dialogue_query(query)
+
+    query_stream_words = normalize_text(text).split()
+
+    if not query_stream_words:
         return []
 
+    query_words = tokenize_normalized(" ".join(query_stream_words))
+
+    candidates: Dict[int, Dict[str, Any]] = {}
+
+    def offer(segment: int, score: float, match_type: str, matched: List[int]) -> None:
+        current = candidates.get(segment)
+
+        if current is None or score > current["score"]:
+            candidates[segment] = {
+                "segment": segment,
+                "score": score,
+                "match_type": match_type,
+                "matched_positions": matched,
+            }
+
+    phrase_length = len(query_stream_words)
+
+    for start in find_phrase_matches(transcript_index, query_stream_words):
+        if crosses_documents(transcript_index, start, start + phrase_length - 1):
+            continue
+
+        offer(
+            segment_at(transcript_index, start),
+            1.0,
+            "phrase",
+            list(range(start, start + phrase_length)),
+        )
+
+    expansions = expand_query_words(transcript_index, query_words, get_fuzzy_index)
+    matched_terms = [
+        term
+        for variants in expansions.values()
+        for term, _ in variants
+    ]
+
+    if not phrase_only and query_words:
+        positions = transcript_index["positions"]
+
+        term_positions = [
+            list(heapq.merge(*(positions[term] for term, _ in variants)))
+            for variants in expansions.values()
+        ]
+        proximity_weight = min(
+            (max(weight for _, weight in variants) if variants else 0.0)
+            for variants in expansions.values()
+        )
+
+        for first, last in find_proximity_windows(
+            term_positions,
+            max_span=phrase_length + PROXIMITY_SLOP,
+        ):
+            if crosses_documents(transcript_index, first, last):
+                continue
+
+            tightness = min(1.0, phrase_length / (last - first + 1))
+
+            offer(
+                segment_at(transcript_index, first),
+                (0.93 + 0.05 * tightness) * proximity_weight,
+                "proximity",
+                find_term_positions(transcript_index, matched_terms, first, last),
+            )
+
+        bm25_scores = score_bm25_segments(transcript_index, query_words, expansions)
+
+        for segment, score in bm25_scores.items():
+            offer(segment, score, "keywords", [])
+
+    top = heapq.nlargest(
+        max_results,
+        candidates.values(),
+        key=lambda candidate: (candidate["score"], -candidate["segment"]),
+    )
+
+    offsets = transcript_index["segment_offsets"]
+
+    for candidate in top:
+        if candidate["matched_positions"]:
+            continue
+
+        segment = candidate["segment"]
+
+        candidate["matched_positions"] = find_term_positions(
+            transcript_index,
+            matched_terms,
+            offsets[segment],
+            offsets[segment + 1] - 1,
+        )
+
+    return top
+
+
+def collect_highlights(
+    transcript_index: Dict[str, Any],
+    stream_positions: List[int],
+) -> Dict[int, List[List[int]]]:
+    """
+    Maps matched stream positions to [start, end] character spans per segment.
+    """
+
+    token_spans = transcript_index["token_spans"]
+    highlights: Dict[int, List[List[int]]] = {}
+
+    for position in stream_positions:
+        span = [token_spans[2 * position], token_spans[2 * position + 1]]
+        segment_highlights = highlights.setdefault(
+            segment_at(transcript_index, position), []
+        )
+
+        # Words expanded from one contraction share a span.
+        if span not in segment_highlights:
+            segment_highlights.append(span)
+
+    return highlights
+
+
+def find_match_time(
+    transcript_index: Dict[str, Any],
+    position: int,
+    stream_positions: List[int],
+) -> float | None:
+    """
+    Start time of the first matched word in segment position, from the
+    Whisper word timings. None when the index has no word timings.
+    """
+
+    token_times = transcript_index.get("token_times")
+
+    if not token_times:
+        return None
+
+    offsets = transcript_index["segment_offsets"]
+    in_segment = [
+        stream_position
+        for stream_position in stream_positions
+        if offsets[position] <= stream_position < offsets[position + 1]
+    ]
+
+    if not in_segment:
+        return None
+
+    time = token_times[min(in_segment)]
+
+    # Merged library indexes hold None for transcripts without timings.
+    return None if time is None else float(time)
+
+
+def build_context_line(
+    segment: Dict[str, Any],
+    highlights: List[List[int]],
+) -> Dict[str, Any]:
+    start = float(segment.get("start", 0))
+
+    return {
+        "timestamp": int(start),
+        "timestamp_label": format_timestamp(start),
+        "text": segment.get("text", ""),
+        "highlights": highlights,
+    }
+
+
+def build_result_with_context(
+    transcript_data: Dict[str, Any],
+    position: int,
+    score: float,
+    match_type: str,
+    highlights: Dict[int, List[List[int]]],
+    context_lines: int,
+    seek_time: float | None = None,
+) -> Dict[str, Any]:
+    segments = transcript_data.get("segments", [])
+
+    last_matched = max(highlights, default=position)
+    before_start = max(0, position - context_lines)
+    after_end = min(len(segments), max(position + context_lines, last_matched) + 1)
+
+    result = build_dialogue_result(
+        transcript_data=transcript_data,
+        segment=segments[position],
+        score=score,
+        seek_time=seek_time,
+    )
+
+    result["match_type"] = match_type
+    result["highlights"] = highlights.get(position, [])
+    result["context_before"] = [
+        build_context_line(segments[line], highlights.get(line, []))
+        for line in range(before_start, position)
+    ]
+    result["context_after"] = [
+        build_context_line(segments[line], highlights.get(line, []))
+        for line in range(position + 1, after_end)
+    ]
+
+    return result
+
+
+def build_dialogue_result(
+    transcript_data: Dict[str, Any],
+    segment: Dict[str, Any],
+    score: float,
+    seek_time: float | None = None,
+) -> Dict[str, Any]:
+    """
+    seek_time, when known, is where the matched words are spoken; the
+    timestamp and link then point there instead of the segment start.
+    """
+
     source_type = transcript_data.get("source_type", "youtube")
     youtube_id = transcript_data.get("youtube_id")
     media_blob_url = transcript_data.get("media_blob_url")
 
-    segments = transcript_data.get("segments", [])
+    text = segment.get("text", "")
+    segment_start = float(segment.get("start", 0))
+    start = segment_start if seek_time is None else seek_time
 
-    scored_results = []
+    result = {
+        "timestamp": int(start),
+        "timestamp_label": format_timestamp(start),
+        "segment_timestamp": int(segment_start),
+        "text": text,
+        "score": round(score, 3),
+        "source_type": source_type,
+    }
 
-    for segment in segments:
-        text = segment.get("text", "")
-        start = float(segment.get("start", 0))
+    if source_type == "youtube" and youtube_id:
+        result["youtube_url"] = build_youtube_timestamp_url(
+            youtube_id=youtube_id,
+            seconds=start,
+        )
+    else:
+        result["media_blob_url"] = media_blob_url
 
-        score = calculate_match_score(clean_query, text)
+    return result
 
-        if score >= 0.5:
-            result = {
-                "timestamp": int(start),
-                "timestamp_label": format_timestamp(start),
-                "text": text,
-                "score": round(score, 3),
-                "source_type": source_type,
-            }
 
-            if source_type == "youtube" and youtube_id:
-                result["youtube_url"] = build_youtube_timestamp_url(
-                    youtube_id=youtube_id,
-                    seconds=start,
-                )
-            else:
-                result["media_blob_url"] = media_blob_url
+def search_dialogue_in_transcript(
+    transcript_data: Dict[str, Any],
+    query: str,
+    max_results: int = 3,
+    transcript_index: Dict[str, Any] | None = None,
+    search_state: Dict[str, Any] | None = None,
+    context_lines: int = 1,
+    fuzzy: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Searches transcript segments through the dialogue index.
 
-            scored_results.append(result)
+    transcript_index is the index uploaded by the audio worker next to the
+    transcript JSON. Jobs processed before the index existed (or with an
+    older index version) get one built in-process from the segments, kept
+    in search_state so it is only built once per cached transcript.
 
-    scored_results.sort(
-        key=lambda item: item["score"],
-        reverse=True,
-    )
+    When the transcript has Whisper word timings, each result's timestamp
+    and link seek to the first matched word rather than the segment start.
+
+    Each result carries the character spans to highlight in its text and
+    up to context_lines neighbouring lines on each side. When a phrase runs
+    into the next segment, the lines it continues into are always included
+    in context_after with their own highlights.
+
+    With fuzzy enabled, query words that never occur in the transcript are
+    matched against close spellings through a deletion index. It is built
+    on the first query that has such a word, once per cached transcript.
+    """
+
+    if not query.strip():
+        return []
+
+    segments = transcript_data.get("segments", [])
 
-    return scored_results[:max_results]
\ No newline at end of file
+    if not is_usable_dialogue_index(transcript_index, len(segments)):
+        transcript_index = get_search_structure(
+            search_state,
+            "dialogue_index",
+            lambda: build_dialogue_index(segments, transcript_data.get("words")),
+        )
+
+    get_fuzzy_index = None
+
+    if fuzzy:
+        get_fuzzy_index = lambda: get_search_structure(
+            search_state,
+            "fuzzy_index",
+            lambda: build_fuzzy_index(transcript_index["postings"]),
+        )
+
+    return [
+        build_result_with_context(
+            transcript_data=transcript_data,
+            position=match["segment"],
+            score=match["score"],
+            match_type=match["match_type"],
+            highlights=collect_highlights(transcript_index, match["matched_positions"]),
+            context_lines=context_lines,
+            seek_time=find_match_time(
+                transcript_index, match["segment"], match["matched_positions"]
+            ),
+        )
+        for match in rank_segments(transcript_index, query, max_results, get_fuzzy_index)
+    ]
+
+
+def search_dialogue_semantic(
+    transcript_data: Dict[str, Any],
+    query_vector: List[float],
+    segment_embeddings: np.ndarray,
+    max_results: int = 3,
+    context_lines: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Ranks segments by cosine similarity to an embedded query.
+
+    segment_embeddings holds one L2-normalized CLIP text vector per segment,
+    computed by the audio worker. Scoring is one matrix-vector product and
+    argpartition picks the top max_results without sorting every segment.
+    """
+
+    segments = transcript_data.get("segments", [])
+
+    if len(segments) == 0 or segment_embeddings.shape[0] != len(segments):
+        return []
+
+    scores = segment_embeddings @ np.asarray(query_vector, dtype="float32")
+
+    k = min(max_results, scores.shape[0])
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    return [
+        build_result_with_context(
+            transcript_data=transcript_data,
+            position=int(position),
+            score=max(float(scores[position]), 0.0),
+            match_type="semantic",
+            highlights={},
+            context_lines=context_lines,
+        )
+        for position in top
+    ]
@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    """
+    The CLIP tokenizer lowercases and collapses whitespace itself, so
+    queries that differ only in case or spacing embed identically.
+    """
+
+    return " ".join(query.lower().split())
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded, thread-safe LRU cache of query embeddings.
+
+    Keys are (model_version, normalized query), so switching models never
+    serves a stale vector. When disk_path is set, misses fall through to a
+    SQLite file shared by every worker process on the box before any
+    inference runs; SQLite handles the cross-process locking.
+
+    get_many() only reads memory and is cheap enough for the event loop.
+    load_many_from_disk() and put_many() touch SQLite and belong on a
+    thread. The memory lock is never held across SQLite I/O, so a slow
+    disk write never blocks a memory lookup.
+    """
+
+    def __init__(self, max_entries: int, disk_path: str = ""):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        # Serializes use of the shared SQLite connection.
+        self._disk_lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _get_disk(self) -> Optional[sqlite3.Connection]:
+        # Called with self._disk_lock held.
+        if not self.disk_path:
+            return None
+
+        if self._disk is None:
+            self._disk = sqlite3.connect(
+                self.disk_path,
+                timeout=5,
+                check_same_thread=False,
+            )
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model TEXT NOT NULL, query TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, query))"
+            )
+            self._disk.commit()
+
+        return self._disk
+
+    def _remember(self, key: tuple, vector: np.ndarray) -> None:
+        # Called with self._lock held.
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(
+        self,
+        model_version: str,
+        queries: List[str],
+    ) -> List[Optional[List[float]]]:
+        """
+        Returns the vector cached in memory for each query, or None where
+        the disk store or inference is still needed.
+        """
+
+        found: List[Optional[List[float]]] = []
+
+        with self._lock:
+            for query in queries:
+                key = (model_version, normalize_query(query))
+                vector = self._entries.get(key)
+
+                if vector is None:
+                    found.append(None)
+                    continue
+
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found.append(vector.tolist())
+
+        return found
+
+    def load_many_from_disk(
+        self,
+        model_version: str,
+        queries: List[str],
+    ) -> List[Optional[List[float]]]:
+        """
+        Looks up queries that missed memory in the disk store, remembering
+        what it finds. Returns None where inference is still needed.
+        """
+
+        keys = [(model_version, normalize_query(query)) for query in queries]
+        rows: List[Optional[np.ndarray]] = []
+
+        with self._disk_lock:
+            for key in keys:
+                rows.append(self._load_from_disk(key))
+
+        found: List[Optional[List[float]]] = []
+
+        with self._lock:
+            for key, vector in zip(keys, rows):
+                if vector is None:
+                    self.misses += 1
+                    found.append(None)
+                    continue
+
+                self._remember(key, vector)
+                self.disk_hits += 1
+                found.append(vector.tolist())
+
+        return found
+
+    def _load_from_disk(self, key: tuple) -> Optional[np.ndarray]:
+        # Called with self._disk_lock held.
+        try:
+            disk = self._get_disk()
+
+            if disk is None:
+                return None
+
+            row = disk.execute(
+                "SELECT vector FROM query_embeddings WHERE model = ? AND query = ?",
+                key,
+            ).fetchone()
+
+        except sqlite3.Error as error:
+            print(f"[Query cache] Disk lookup failed: {error}")
+            return None
+
+        if row is None:
+            return None
+
+        return np.frombuffer(row[0], dtype="float32").copy()
+
+    def put_many(
+        self,
+        model_version: str,
+        queries: List[str],
+        vectors: List[List[float]],
+    ) -> None:
+        rows = []
+
+        with self._lock:
+            for query, values in zip(queries, vectors):
+                key = (model_version, normalize_query(query))
+                vector = np.asarray(values, dtype="float32")
+
+                self._remember(key, vector)
+                rows.append((*key, vector.tobytes()))
+
+        with self._disk_lock:
+            try:
+                disk = self._get_disk()
+
+                if disk is not None:
+                    disk.executemany(
+                        "INSERT OR REPLACE INTO query_embeddings (model, query, vector) "
+                        "VALUES (?, ?, ?)",
+                        rows,
+                    )
+                    disk.commit()
+
+            except sqlite3.Error as error:
+                # The in-memory cache still works without the disk store.
+                print(f"[Query cache] Disk write failed: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_path": self.disk_path or None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item inference calls into batches.
+
+    Callers submit items and wait on futures, either blocking or, from the
+    event loop, through asyncio.wrap_future. One daemon thread takes the
+    first waiting item, keeps collecting for up to max_wait_seconds or until
+    max_batch_size items are queued, runs run_batch once over all of them
+    and hands each caller its own output. The wait bounds the latency added
+    to a lone request; under load batches fill before the wait runs out.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        name: str = "micro-batcher",
+    ):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.name = name
+
+        self._queue: "queue.Queue[tuple[Any, Future]]" = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=self.name,
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def submit_many(self, items: List[Any]) -> List[Future]:
+        self._ensure_worker()
+
+        futures = []
+
+        for item in items:
+            future: Future = Future()
+            self._queue.put((item, future))
+            futures.append(future)
+
+        return futures
+
+    def run(self, items: List[Any]) -> List[Any]:
+        """
+        Submits items and waits for their outputs, in order.
+        """
+
+        return [future.result() for future in self.submit_many(items)]
+
+    def _collect_batch(self) -> List[tuple[Any, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            # A caller awaiting from the event loop cancels its future when
+            # its request goes away; those items are dropped unrun.
+            batch = [
+                (item, future)
+                for item, future in self._collect_batch()
+                if future.set_running_or_notify_cancel()
+            ]
+
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+
+            try:
+                outputs = self.run_batch(items)
+
+                if len(outputs) != len(items):
+                    raise RuntimeError(
+                        f"Batch returned {len(outputs)} outputs for {len(items)} items."
+                    )
+
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+
+            for (_, future), output in zip(batch, outputs):
+                future.set_result(output)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
@@ -0,0 +1,84 @@
+import io
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+# Per-job scene snapshot, stored as <job_id>.scenes.npz next to the
+# transcripts. The video worker writes it after indexing; the backend
+# answers visual searches from it with one matrix-vector product, without
+# a vector store round trip.
+#
+#   vectors      float32[n, 512]  L2-normalized CLIP image vectors
+#   scene_index  int32[n]
+#   timestamp    float32[n]       seconds of the embedded frame
+#   scene_start  float32[n]
+#   scene_end    float32[n]
+#   shared       uint8[...]       UTF-8 JSON of the metadata every scene
+#                                 of the job has in common
+#
+# numpy only, so the Modal video worker can ship it.
+
+SCENE_SNAPSHOT_VERSION = 1
+
+SHARED_FIELDS = (
+    "job_id",
+    "source_type",
+    "youtube_id",
+    "media_blob_url",
+    "original_file_name",
+)
+
+
+def encode_scene_snapshot(
+    vectors: List[List[float]],
+    metadata: List[Dict[str, Any]],
+) -> bytes:
+    matrix = np.asarray(vectors, dtype="float32").reshape(len(metadata), -1)
+
+    shared = {"version": SCENE_SNAPSHOT_VERSION}
+
+    if metadata:
+        shared.update({
+            field: metadata[0].get(field)
+            for field in SHARED_FIELDS
+        })
+
+    buffer = io.BytesIO()
+
+    np.savez(
+        buffer,
+        vectors=matrix,
+        scene_index=np.array([item["scene_index"] for item in metadata], dtype="int32"),
+        timestamp=np.array([item["timestamp"] for item in metadata], dtype="float32"),
+        scene_start=np.array([item["scene_start"] for item in metadata], dtype="float32"),
+        scene_end=np.array([item["scene_end"] for item in metadata], dtype="float32"),
+        shared=np.frombuffer(json.dumps(shared).encode("utf-8"), dtype="uint8"),
+    )
+
+    return buffer.getvalue()
+
+
+def decode_scene_snapshot(data: bytes) -> Dict[str, Any]:
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        snapshot = {
+            key: archive[key]
+            for key in ("vectors", "scene_index", "timestamp", "scene_start", "scene_end")
+        }
+        shared = json.loads(archive["shared"].tobytes().decode("utf-8"))
+
+    if shared.get("version") != SCENE_SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported scene snapshot version: {shared.get('version')}")
+
+    snapshot["shared"] = shared
+
+    return snapshot
+
+
+def scene_snapshot_nbytes(snapshot: Dict[str, Any]) -> int:
+    return sum(
+        value.nbytes
+        for value in snapshot.values()
+        if isinstance(value, np.ndarray)
+    )
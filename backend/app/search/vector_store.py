@@ -0,0 +1,338 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+# Scene vectors go through this interface instead of calling Pinecone
+# directly. Like dialogue_index.py, this module takes its settings as
+# arguments and imports Pinecone lazily, so the Modal video workers can
+# ship and use it without the backend config.
+#
+# A vector is (id, values, metadata), the tuple form Pinecone's upsert
+# takes. query() returns matches as {"id", "score", "metadata"} dicts,
+# best first; query_async() is the same for async request handlers, and
+# close_async() releases what it opened, at app shutdown.
+# PineconeVectorStore.query_async needs the pinecone[asyncio] extra.
+
+Vector = Tuple[str, List[float], Dict[str, Any]]
+
+
+class PineconeVectorStore:
+    """
+    One pooled client per process for each path: the sync Index keeps its
+    own connection pool for worker and thread-pool callers, and the
+    asyncio index (aiohttp) is created once, on first use inside the event
+    loop, so async handlers wait on Pinecone without holding a thread.
+    Async queries are cut off after timeout_seconds.
+    """
+
+    name = "pinecone"
+
+    def __init__(
+        self,
+        api_key: str,
+        index_name: str,
+        pool_threads: int = 8,
+        timeout_seconds: float = 10.0,
+    ):
+        from pinecone import Pinecone
+
+        self.client = Pinecone(api_key=api_key)
+        self.index_name = index_name
+        self.index = self.client.Index(index_name, pool_threads=pool_threads)
+        self.timeout_seconds = timeout_seconds
+
+        self._async_index = None
+        self._async_lock = asyncio.Lock()
+
+    def upsert(self, namespace: str, vectors: List[Vector]) -> None:
+        self.index.upsert(
+            vectors=vectors,
+            namespace=namespace,
+        )
+
+    def flush(self, namespace: str) -> None:
+        # Pinecone writes are durable on upsert.
+        pass
+
+    @staticmethod
+    def format_matches(search_response) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": match.get("id"),
+                "score": float(match.get("score") or 0),
+                "metadata": match.get("metadata") or {},
+            }
+            for match in search_response.get("matches", [])
+        ]
+
+    def query(
+        self,
+        namespace: str,
+        vector: List[float],
+        top_k: int,
+        filter: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        search_response = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            namespace=namespace,
+            include_metadata=True,
+            filter=filter,
+        )
+
+        return self.format_matches(search_response)
+
+    async def get_async_index(self):
+        if self._async_index is not None:
+            return self._async_index
+
+        async with self._async_lock:
+            if self._async_index is None:
+                description = await asyncio.to_thread(
+                    self.client.describe_index, self.index_name
+                )
+                self._async_index = self.client.IndexAsyncio(host=description.host)
+
+        return self._async_index
+
+    async def query_async(
+        self,
+        namespace: str,
+        vector: List[float],
+        top_k: int,
+        filter: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        index = await self.get_async_index()
+
+        search_response = await asyncio.wait_for(
+            index.query(
+                vector=vector,
+                top_k=top_k,
+                namespace=namespace,
+                include_metadata=True,
+                filter=filter,
+            ),
+            timeout=self.timeout_seconds,
+        )
+
+        return self.format_matches(search_response)
+
+    async def close_async(self) -> None:
+        # The asyncio index owns an aiohttp session.
+        if self._async_index is not None:
+            await self._async_index.close()
+            self._async_index = None
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Dict[str, Any] | None) -> bool:
+    """
+    The subset of Pinecone's metadata filter the app uses:
+    {"field": value} and {"field": {"$eq": value}}.
+    """
+
+    for field, condition in (filter or {}).items():
+        expected = condition.get("$eq") if isinstance(condition, dict) else condition
+
+        if metadata.get(field) != expected:
+            return False
+
+    return True
+
+
+def top_k_by_score(scores: np.ndarray, top_k: int) -> np.ndarray:
+    k = min(top_k, scores.shape[0])
+
+    if k <= 0:
+        return np.array([], dtype="int64")
+
+    top = np.argpartition(-scores, k - 1)[:k]
+
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class LocalVectorStore:
+    """
+    One float32 matrix per namespace on local disk, searched exactly.
+
+    <root>/<namespace>/vectors.npy holds L2-normalized rows, and
+    records.json holds the parallel ids and metadata. Queries memory-map
+    the matrix, so the OS page cache keeps hot namespaces resident and
+    cold ones cost nothing; cosine top-k is one matrix-vector product and
+    an argpartition. Upserts are buffered until flush(namespace).
+    """
+
+    name = "local"
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+        self._pending: Dict[str, Dict[str, Tuple[List[float], Dict[str, Any]]]] = {}
+        self._loaded: Dict[str, Tuple[float, np.ndarray, List[str], List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _namespace_dir(self, namespace: str) -> str:
+        if not namespace or os.sep in namespace or namespace in {".", ".."}:
+            raise ValueError(f"Invalid vector namespace: {namespace!r}")
+
+        return os.path.join(self.root_dir, namespace)
+
+    def _read_namespace(self, namespace: str):
+        namespace_dir = self._namespace_dir(namespace)
+        vectors_path = os.path.join(namespace_dir, "vectors.npy")
+
+        try:
+            modified_at = os.path.getmtime(vectors_path)
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            loaded = self._loaded.get(namespace)
+
+            if loaded is not None and loaded[0] == modified_at:
+                return loaded
+
+        matrix = np.load(vectors_path, mmap_mode="r", allow_pickle=False)
+
+        with open(os.path.join(namespace_dir, "records.json"), encoding="utf-8") as file:
+            records = json.load(file)
+
+        loaded = (modified_at, matrix, records["ids"], records["metadata"])
+
+        with self._lock:
+            self._loaded[namespace] = loaded
+
+        return loaded
+
+    def upsert(self, namespace: str, vectors: List[Vector]) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(namespace, {})
+
+            for vector_id, values, metadata in vectors:
+                pending[vector_id] = (values, metadata)
+
+    def flush(self, namespace: str) -> None:
+        with self._lock:
+            pending = self._pending.pop(namespace, {})
+
+        if not pending:
+            return
+
+        records: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        existing = self._read_namespace(namespace)
+
+        if existing is not None:
+            _, matrix, ids, metadata = existing
+            records = {
+                vector_id: (matrix[row], metadata[row])
+                for row, vector_id in enumerate(ids)
+            }
+
+        records.update(pending)
+
+        ids = list(records)
+        matrix = np.asarray([records[vector_id][0] for vector_id in ids], dtype="float32")
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+
+        namespace_dir = self._namespace_dir(namespace)
+        os.makedirs(namespace_dir, exist_ok=True)
+
+        # Readers key off the vectors.npy mtime, so records.json is
+        # replaced first and vectors.npy last.
+        records_path = os.path.join(namespace_dir, "records.json")
+
+        with open(records_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(
+                {"ids": ids, "metadata": [records[vector_id][1] for vector_id in ids]},
+                file,
+                separators=(",", ":"),
+            )
+
+        os.replace(records_path + ".tmp", records_path)
+
+        vectors_path = os.path.join(namespace_dir, "vectors.npy")
+
+        with open(vectors_path + ".tmp", "wb") as file:
+            np.save(file, matrix, allow_pickle=False)
+
+        os.replace(vectors_path + ".tmp", vectors_path)
+
+    def query(
+        self,
+        namespace: str,
+        vector: List[float],
+        top_k: int,
+        filter: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        loaded = self._read_namespace(namespace)
+
+        if loaded is None:
+            return []
+
+        _, matrix, ids, metadata = loaded
+
+        query_vector = np.asarray(vector, dtype="float32").reshape(-1)
+        norm = np.linalg.norm(query_vector)
+
+        if norm:
+            query_vector = query_vector / norm
+
+        scores = matrix @ query_vector
+
+        if filter:
+            allowed = np.array([matches_filter(item, filter) for item in metadata], dtype=bool)
+            scores = np.where(allowed, scores, -np.inf)
+            top_k = min(top_k, int(allowed.sum()))
+
+        return [
+            {
+                "id": ids[row],
+                "score": float(scores[row]),
+                "metadata": metadata[row],
+            }
+            for row in top_k_by_score(scores, top_k)
+        ]
+
+    async def query_async(
+        self,
+        namespace: str,
+        vector: List[float],
+        top_k: int,
+        filter: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        # Scoring is a numpy matrix-vector product over the namespace, and
+        # may page the matrix in from disk; keep it off the event loop.
+        return await asyncio.to_thread(self.query, namespace, vector, top_k, filter)
+
+    async def close_async(self) -> None:
+        # Nothing is held open between queries.
+        return None
+
+
+def create_vector_store(
+    kind: str,
+    pinecone_api_key: str = "",
+    pinecone_index_name: str = "",
+    local_dir: str = "",
+    pinecone_pool_threads: int = 8,
+    pinecone_timeout_seconds: float = 10.0,
+):
+    if kind == "pinecone":
+        return PineconeVectorStore(
+            pinecone_api_key,
+            pinecone_index_name,
+            pool_threads=pinecone_pool_threads,
+            timeout_seconds=pinecone_timeout_seconds,
+        )
+
+    if kind == "local":
+        return LocalVectorStore(local_dir)
+
+    raise ValueError(f"Unknown vector store: {kind}. Use pinecone or local.")
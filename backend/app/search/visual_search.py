@@ -1,58 +1,127 @@
+import asyncio
+import heapq
+import io
+from itertools import islice
 from typing import Any, Dict, List
 
 import numpy as np
-import torch
-from pinecone import Pinecone
-from transformers import CLIPModel, CLIPProcessor
-
+from transformers import (
+    CLIPImageProcessor,
+    CLIPTextModelWithProjection,
+    CLIPTokenizerFast,
+    CLIPVisionModelWithProjection,
+)
+
+from app.azure_utils import load_scene_snapshot
 from app.config import settings
+from app.inference import run_batched, run_forward_pass
+from app.lazy_resource import LazyResource
+from app.search.clip_text_engine import (
+    TorchTextEngine,
+    build_text_engine,
+    check_engine_parity,
+)
+from app.search.embedding_cache import QueryEmbeddingCache, normalize_query
+from app.search.micro_batcher import MicroBatcher
+from app.search.dialogue_search import format_timestamp
+from app.search.vector_store import create_vector_store, top_k_by_score
+from app.search.visual_sequence import find_best_sequences
+from app.youtube_utils import build_youtube_timestamp_url
 
 
-_clip_model = None
-_clip_processor = None
-_pinecone_index = None
+CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
 
+_query_embedding_cache = QueryEmbeddingCache(
+    max_entries=settings.QUERY_EMBEDDING_CACHE_SIZE,
+    disk_path=settings.QUERY_EMBEDDING_CACHE_PATH,
+)
 
-def get_clip_model_and_processor():
-    global _clip_model, _clip_processor
 
-    if _clip_model is not None and _clip_processor is not None:
-        return _clip_model, _clip_processor
+def load_clip_text_weights():
+    """
+    Text search only needs the text tower, its projection and the
+    tokenizer, so only those are loaded here. The vision tower and the
+    image processor are loaded separately, on the first image query (see
+    load_clip_vision_model), or at preload with PRELOAD_CLIP_VISION.
 
-    print("[CLIP] Loading CLIP model in backend...")
+    The checkpoint holds both towers in one file, so from_pretrained still
+    downloads and reads all of it; what shrinks is resident memory, since
+    the vision weights are dropped rather than kept.
+    """
 
-    model_name = "openai/clip-vit-base-patch32"
+    print("[CLIP] Loading CLIP text model in backend...")
 
-    _clip_model = CLIPModel.from_pretrained(model_name)
-    _clip_processor = CLIPProcessor.from_pretrained(model_name)
+    model = CLIPTextModelWithProjection.from_pretrained(CLIP_MODEL_NAME)
+    tokenizer = CLIPTokenizerFast.from_pretrained(CLIP_MODEL_NAME)
 
-    _clip_model.eval()
+    model.eval()
 
-    print("[CLIP] Backend CLIP model loaded.")
+    return model, tokenizer
 
-    return _clip_model, _clip_processor
 
+_clip_text_weights = LazyResource("clip_text_weights", load_clip_text_weights)
 
-def warmup_clip_model() -> None:
-    model, processor = get_clip_model_and_processor()
 
-    inputs = processor(
-        text=["warmup"],
-        return_tensors="pt",
-        padding=True,
-        truncation=True,
-    )
+def load_clip_text_engine():
+    """
+    CLIP_TEXT_ENGINE picks how the text tower runs (see clip_text_engine).
+    Any engine other than torch is checked against torch float32 on a few
+    probe queries first; if it fails to build or falls below
+    CLIP_ENGINE_PARITY_THRESHOLD, the backend stays on torch.
+
+    One warmup pass runs before the engine is handed out, so a ready
+    engine answers its first query at full speed.
+    """
+
+    model, tokenizer = _clip_text_weights.get()
+
+    engine = TorchTextEngine(model, tokenizer)
+
+    if settings.CLIP_TEXT_ENGINE != "torch":
+        try:
+            candidate = build_text_engine(
+                settings.CLIP_TEXT_ENGINE,
+                model,
+                tokenizer,
+                settings.CLIP_ONNX_PATH,
+            )
+
+            parity = check_engine_parity(
+                candidate,
+                engine,
+                threshold=settings.CLIP_ENGINE_PARITY_THRESHOLD,
+            )
+            print(f"[CLIP] Engine parity: {parity}")
+
+            if parity["passed"]:
+                engine = candidate
+
+        except Exception as error:
+            print(f"[CLIP] Could not use engine {settings.CLIP_TEXT_ENGINE}: {error}")
+
+    engine.embed(["warmup"])
+
+    print(f"[CLIP] Backend CLIP text model loaded ({engine.name}).")
+
+    return engine
 
-    with torch.no_grad():
-        text_outputs = model.text_model(
-            input_ids=inputs.input_ids,
-            attention_mask=inputs.attention_mask,
-        )
 
-        pooled_output = text_outputs.pooler_output
-        _ = model.text_projection(pooled_output)
+_clip_text_engine = LazyResource("clip_text_engine", load_clip_text_engine)
 
-    print("[CLIP] Backend CLIP warmup complete.")
+
+def get_clip_text_engine():
+    return _clip_text_engine.get()
+
+
+def get_clip_model_version() -> str:
+    """
+    Cache key for query vectors: a different engine gives slightly
+    different vectors, so it is part of the model version. It names the
+    engine actually loaded, not CLIP_TEXT_ENGINE, because a candidate that
+    fails to build or fails parity leaves the backend on torch.
+    """
+
+    return f"{CLIP_MODEL_NAME}/{get_clip_text_engine().name}"
 
 
 def normalize_vector(values):
@@ -71,64 +140,262 @@ def normalize_vector(values):
     return (array / norm).tolist()
 
 
-def embed_text_query(query: str) -> List[float]:
-    model, processor = get_clip_model_and_processor()
+def run_clip_text_model(queries: List[str]) -> List[List[float]]:
+    """
+    Embeds several queries in one padded CLIP forward pass.
+    """
+
+    vectors = get_clip_text_engine().embed(queries)
+
+    return [normalize_vector(vector) for vector in vectors]
+
+
+def run_clip_text_batch(queries: List[str]) -> List[List[float]]:
+    """
+    One batched forward pass on the inference executor. The vectors are
+    written to the query embedding cache there too, so its disk write stays
+    off the event loop.
+    """
+
+    vectors = run_clip_text_model(queries)
+    _query_embedding_cache.put_many(get_clip_model_version(), queries, vectors)
+
+    return vectors
+
+
+# Concurrent requests share CLIP forward passes instead of each running
+# its own single-query pass on the same cores. Only the pass itself takes
+# an inference thread, so a batch keeps filling while the last one runs.
+_clip_text_batcher = MicroBatcher(
+    run_batch=lambda queries: run_forward_pass(run_clip_text_batch, queries),
+    max_batch_size=settings.CLIP_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.CLIP_BATCH_MAX_WAIT_MS / 1000,
+    name="clip-text-batcher",
+)
+
+
+async def embed_text_queries(queries: List[str]) -> List[List[float]]:
+    """
+    Embeds queries through the query embedding cache. Only the distinct
+    queries that miss the cache go through CLIP, coalesced with misses from
+    concurrent requests by the micro-batcher.
+
+    Runs on the event loop: memory hits answer without waiting for any
+    thread, the disk store is read on a worker thread, and misses are
+    awaited without holding an inference thread.
+    """
+
+    if not queries:
+        return []
+
+    if not _clip_text_engine.is_ready():
+        # The engine decides the cache key, so it is loaded first, off the
+        # loop; after startup warmup it is always ready.
+        await asyncio.to_thread(get_clip_text_engine)
+
+    model_version = get_clip_model_version()
+    vectors = _query_embedding_cache.get_many(model_version, queries)
+    not_in_memory = [query for query, vector in zip(queries, vectors) if vector is None]
+
+    if not_in_memory:
+        if _query_embedding_cache.disk_path:
+            found = await asyncio.to_thread(
+                _query_embedding_cache.load_many_from_disk,
+                model_version,
+                not_in_memory,
+            )
+        else:
+            found = _query_embedding_cache.load_many_from_disk(model_version, not_in_memory)
+
+        found_iter = iter(found)
+        vectors = [
+            next(found_iter) if vector is None else vector
+            for vector in vectors
+        ]
+
+    missing = {
+        normalize_query(query): query
+        for query, vector in zip(queries, vectors)
+        if vector is None
+    }
+
+    if missing:
+        computed = dict(zip(
+            missing,
+            await run_batched(_clip_text_batcher, list(missing.values())),
+        ))
+
+        vectors = [
+            computed[normalize_query(query)] if vector is None else vector
+            for query, vector in zip(queries, vectors)
+        ]
+
+    return vectors
+
+
+def get_query_embedding_cache_stats() -> Dict[str, Any]:
+    return _query_embedding_cache.stats()
+
+
+def get_clip_batcher_stats() -> Dict[str, Any]:
+    return {
+        "text": _clip_text_batcher.stats(),
+        "image": _clip_image_batcher.stats(),
+    }
+
+
+async def embed_text_query(query: str) -> List[float]:
+    return (await embed_text_queries([query]))[0]
+
+
+def load_clip_vision_model():
+    """
+    The vision tower is only needed for query-by-image, so it is loaded on
+    the first image query rather than at startup, and text-only deployments
+    never hold it.
+    """
+
+    print("[CLIP] Loading CLIP vision model in backend...")
+
+    model = CLIPVisionModelWithProjection.from_pretrained(CLIP_MODEL_NAME)
+    model.eval()
+
+    processor = CLIPImageProcessor.from_pretrained(CLIP_MODEL_NAME)
+
+    print("[CLIP] Backend CLIP vision model loaded.")
+
+    return model, processor
 
-    inputs = processor(
-        text=[query],
-        return_tensors="pt",
-        padding=True,
-        truncation=True,
-    )
+
+_clip_vision_model = LazyResource("clip_vision_model", load_clip_vision_model)
+
+
+def get_clip_vision_model_and_processor():
+    return _clip_vision_model.get()
+
+
+def run_clip_vision_model(images) -> List[List[float]]:
+    """
+    Embeds several PIL images in one CLIP vision forward pass.
+    """
+
+    import torch
+
+    model, processor = get_clip_vision_model_and_processor()
+
+    inputs = processor(images=images, return_tensors="pt")
 
     with torch.no_grad():
-        text_outputs = model.text_model(
-            input_ids=inputs.input_ids,
-            attention_mask=inputs.attention_mask,
-        )
+        image_features = model(pixel_values=inputs.pixel_values).image_embeds
 
-        pooled_output = text_outputs.pooler_output
-        text_features = model.text_projection(pooled_output)
+    vectors = image_features.detach().cpu().numpy()
 
-    vector = text_features.squeeze(0).detach().cpu().numpy()
+    return [normalize_vector(vector) for vector in vectors]
 
-    return normalize_vector(vector)
 
+_clip_image_batcher = MicroBatcher(
+    run_batch=lambda images: run_forward_pass(run_clip_vision_model, images),
+    max_batch_size=settings.CLIP_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.CLIP_BATCH_MAX_WAIT_MS / 1000,
+    name="clip-image-batcher",
+)
 
-def get_pinecone_index():
-    global _pinecone_index
 
-    if _pinecone_index is not None:
-        return _pinecone_index
+def load_query_image(data: bytes):
+    """
+    Decodes an uploaded still frame, refusing oversized images before their
+    pixels are decoded. The image is shrunk to IMAGE_QUERY_MAX_SIDE up
+    front (JPEG via draft mode, at decode time): CLIP only sees 224x224, so
+    full-resolution screenshots would just cost decode and resize time.
 
-    pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-    _pinecone_index = pc.Index(settings.PINECONE_INDEX_NAME)
+    Every way the upload can be unusable (unknown format, truncated or
+    corrupt data, a decompression bomb, too many pixels) raises ValueError.
+    """
 
-    return _pinecone_index
+    from PIL import Image, UnidentifiedImageError
 
+    try:
+        image = Image.open(io.BytesIO(data))
 
-def search_visual_scenes_backend(
-    job_id: str,
-    namespace: str,
-    query: str,
-    top_k: int = 3,
-) -> Dict[str, Any]:
-    query_vector = embed_text_query(query)
+        width, height = image.size
 
-    index = get_pinecone_index()
+        if width * height > settings.IMAGE_QUERY_MAX_PIXELS:
+            raise ValueError(
+                f"Image is too large: {width}x{height}. "
+                f"At most {settings.IMAGE_QUERY_MAX_PIXELS} pixels are allowed."
+            )
 
-    search_response = index.query(
-        vector=query_vector,
-        top_k=top_k,
-        namespace=namespace,
-        include_metadata=True,
-        filter={
-            "job_id": {"$eq": job_id}
-        },
-    )
+        max_side = settings.IMAGE_QUERY_MAX_SIDE
+
+        image.draft("RGB", (max_side, max_side))
+        image = image.convert("RGB")
+        image.thumbnail((max_side, max_side))
+
+    except UnidentifiedImageError:
+        raise ValueError("The uploaded file is not a supported image.")
+
+    except (OSError, Image.DecompressionBombError) as error:
+        raise ValueError(f"The uploaded image could not be decoded: {error}")
+
+    return image
+
+
+async def embed_image_query(image) -> List[float]:
+    return (await run_batched(_clip_image_batcher, [image]))[0]
 
-    matches = search_response.get("matches", [])
 
+# Concurrent first searches would otherwise each build a client and
+# connection pool.
+_vector_store = LazyResource(
+    "vector_store",
+    lambda: create_vector_store(
+        settings.VECTOR_STORE,
+        pinecone_api_key=settings.PINECONE_API_KEY,
+        pinecone_index_name=settings.PINECONE_INDEX_NAME,
+        local_dir=settings.LOCAL_VECTOR_STORE_DIR,
+        pinecone_pool_threads=settings.PINECONE_QUERY_CONCURRENCY,
+        pinecone_timeout_seconds=settings.PINECONE_QUERY_TIMEOUT_SECONDS,
+    ),
+)
+
+
+def get_vector_store():
+    return _vector_store.get()
+
+
+async def close_vector_store() -> None:
+    if _vector_store.is_ready():
+        await get_vector_store().close_async()
+
+
+def preload_clip_weights() -> None:
+    """
+    Loads the CLIP weights without running them, for a server that imports
+    the app once and then forks its workers (see gunicorn.conf.py). The
+    forked workers share the parent's weight pages copy-on-write, and
+    inference only reads them, so N workers hold one copy.
+
+    No forward pass runs here: torch's thread pools are not fork-safe, so
+    each worker does its own warmup pass after the fork.
+    """
+
+    _clip_text_weights.get()
+
+    if settings.PRELOAD_CLIP_VISION:
+        _clip_vision_model.get()
+
+
+def warmup_visual_search() -> None:
+    """
+    Loads what text visual search needs: the CLIP text engine (with its
+    warmup pass) and the vector store client.
+    """
+
+    get_clip_text_engine()
+    get_vector_store()
+
+
+def format_visual_matches(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     matches = sorted(
         matches,
         key=lambda match: float(match.get("score") or 0),
@@ -152,8 +419,425 @@ def search_visual_scenes_backend(
             "scene_end": metadata.get("scene_end"),
         })
 
+    return results
+
+
+def build_snapshot_scene_result(
+    snapshot: Dict[str, Any],
+    row: int,
+    score: float,
+) -> Dict[str, Any]:
+    shared = snapshot["shared"]
+    source_type = shared.get("source_type") or "youtube"
+    youtube_id = shared.get("youtube_id")
+
+    timestamp = float(snapshot["timestamp"][row])
+
+    return {
+        "score": float(score),
+        "timestamp": timestamp,
+        "timestamp_label": format_timestamp(timestamp),
+        "youtube_url": (
+            build_youtube_timestamp_url(youtube_id, timestamp)
+            if source_type == "youtube" and youtube_id
+            else None
+        ),
+        "media_blob_url": shared.get("media_blob_url") if source_type != "youtube" else None,
+        "source_type": source_type,
+        "scene_index": int(snapshot["scene_index"][row]),
+        "scene_start": float(snapshot["scene_start"][row]),
+        "scene_end": float(snapshot["scene_end"][row]),
+    }
+
+
+def search_scene_snapshot(
+    snapshot: Dict[str, Any],
+    query_vector: List[float],
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """
+    Exact cosine top-k over a job's scene snapshot, in the same result
+    shape as format_visual_matches.
+    """
+
+    scores = snapshot["vectors"] @ np.asarray(query_vector, dtype="float32")
+
+    return [
+        build_snapshot_scene_result(snapshot, row, scores[row])
+        for row in top_k_by_score(scores, top_k)
+    ]
+
+
+def get_job_scene_snapshot(job_id: str) -> Dict[str, Any] | None:
+    if not settings.VISUAL_SNAPSHOT_SEARCH:
+        return None
+
+    try:
+        snapshot = load_scene_snapshot(job_id)
+    except Exception as error:
+        print(f"[Visual search] Could not load scene snapshot for {job_id}: {error}")
+        return None
+
+    if snapshot is None or snapshot["shared"].get("job_id") != job_id:
+        return None
+
+    return snapshot
+
+
+def search_job_scene_snapshot(
+    job_id: str,
+    query_vector: List[float],
+    top_k: int,
+) -> List[Dict[str, Any]] | None:
+    """
+    Loads and scores the job's scene snapshot in one call, so both run on
+    the same worker thread. None when the job has no usable snapshot.
+    """
+
+    snapshot = get_job_scene_snapshot(job_id)
+
+    if snapshot is None:
+        return None
+
+    return search_scene_snapshot(snapshot, query_vector, top_k)
+
+
+async def query_visual_scenes(
+    job_id: str,
+    namespace: str,
+    query_vector: List[float],
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """
+    Served from the job's scene snapshot when it has one (pulled once and
+    kept in the blob cache), otherwise from the vector store. Snapshot
+    loading and scoring run on a worker thread, never on the event loop.
+    The vector store is awaited, so a slow Pinecone round trip holds no
+    thread.
+    """
+
+    results = await asyncio.to_thread(
+        search_job_scene_snapshot, job_id, query_vector, top_k
+    )
+
+    if results is not None:
+        return results
+
+    matches = await get_vector_store().query_async(
+        namespace=namespace,
+        vector=query_vector,
+        top_k=top_k,
+        filter={
+            "job_id": {"$eq": job_id}
+        },
+    )
+
+    return format_visual_matches(matches)
+
+
+async def search_visual_scenes_backend(
+    job_id: str,
+    namespace: str,
+    query: str,
+    top_k: int = 3,
+) -> Dict[str, Any]:
+    query_vector = await embed_text_query(query)
+
+    results = await query_visual_scenes(
+        job_id=job_id,
+        namespace=namespace,
+        query_vector=query_vector,
+        top_k=top_k,
+    )
+
     return {
         "query": query,
         "count": len(results),
         "results": results,
-    }
\ No newline at end of file
+    }
+
+
+async def search_visual_scenes_by_image(
+    job_id: str,
+    namespace: str,
+    image,
+    top_k: int = 3,
+) -> Dict[str, Any]:
+    """
+    Finds the scenes that look most like an uploaded still frame, already
+    decoded by load_query_image. Image and scene vectors both come from
+    the CLIP vision tower, so this is a direct image-to-image cosine search.
+    """
+
+    query_vector = await embed_image_query(image)
+
+    results = await query_visual_scenes(
+        job_id=job_id,
+        namespace=namespace,
+        query_vector=query_vector,
+        top_k=top_k,
+    )
+
+    return {
+        "count": len(results),
+        "results": results,
+    }
+
+
+def score_sequence_snapshot(
+    job_id: str,
+    query_matrix: np.ndarray,
+):
+    """
+    Scores every scene of the job's snapshot against every sub-query in
+    one matrix product. Returns (scores [steps, scenes], scenes) with scenes
+    sorted by start, or None when the job has no usable snapshot.
+    """
+
+    snapshot = get_job_scene_snapshot(job_id)
+
+    if snapshot is None:
+        return None
+
+    order = np.argsort(snapshot["scene_start"], kind="stable")
+    scores = (snapshot["vectors"][order] @ query_matrix.T).T
+
+    scenes = [
+        build_snapshot_scene_result(snapshot, int(row), 0.0)
+        for row in order
+    ]
+
+    return scores, scenes
+
+
+async def get_sequence_scene_table(
+    job_id: str,
+    namespace: str,
+    query_vectors: List[List[float]],
+):
+    """
+    Returns (scores [steps, scenes], scenes) with scenes sorted by start.
+
+    From the job's scene snapshot every scene is scored against every
+    sub-query in one matrix product. Without a snapshot, each sub-query's
+    top SEQUENCE_CANDIDATES vector store matches are pooled instead, and a
+    scene missing from a sub-query's matches cannot fill that step.
+
+    The snapshot path runs on a worker thread, loading and scoring alike.
+    """
+
+    table = await asyncio.to_thread(
+        score_sequence_snapshot,
+        job_id,
+        np.asarray(query_vectors, dtype="float32"),
+    )
+
+    if table is not None:
+        return table
+
+    grouped_matches = await gather_limited(
+        (
+            get_vector_store().query_async(
+                namespace=namespace,
+                vector=query_vector,
+                top_k=settings.SEQUENCE_CANDIDATES,
+                filter={"job_id": {"$eq": job_id}},
+            )
+            for query_vector in query_vectors
+        ),
+        settings.PINECONE_QUERY_CONCURRENCY,
+    )
+
+    scenes_by_index: Dict[int, Dict[str, Any]] = {}
+    step_scores: List[Dict[int, float]] = []
+
+    for matches in grouped_matches:
+        scores_by_index = {}
+
+        for result in format_visual_matches(matches):
+            scene_index = int(result["scene_index"])
+            scenes_by_index.setdefault(scene_index, result)
+            scores_by_index[scene_index] = float(result["score"] or 0)
+
+        step_scores.append(scores_by_index)
+
+    scenes = sorted(
+        scenes_by_index.values(),
+        key=lambda scene: (float(scene.get("scene_start") or 0), scene["scene_index"]),
+    )
+
+    scores = np.array(
+        [
+            [step.get(scene["scene_index"], -np.inf) for scene in scenes]
+            for step in step_scores
+        ],
+        dtype="float64",
+    ).reshape(len(step_scores), len(scenes))
+
+    return scores, scenes
+
+
+async def search_visual_sequence(
+    job_id: str,
+    namespace: str,
+    queries: List[str],
+    max_gap_seconds: float,
+    top_k: int = 3,
+) -> Dict[str, Any]:
+    """
+    Finds moments where the sub-queries appear in order ("a beach, then a
+    helicopter"), each within max_gap_seconds of the previous one.
+
+    All sub-queries are embedded in one batch and scored against the job's
+    scenes at once; find_best_sequences then picks the best chains in one
+    O(n log n) pass per step over the n scenes, on a worker thread.
+    """
+
+    query_vectors = await embed_text_queries(queries)
+
+    scores, scenes = await get_sequence_scene_table(job_id, namespace, query_vectors)
+
+    starts = np.array([float(scene.get("scene_start") or 0) for scene in scenes])
+    ends = np.array([float(scene.get("scene_end") or 0) for scene in scenes])
+
+    chains = await asyncio.to_thread(
+        find_best_sequences, scores, starts, ends, max_gap_seconds, top_k
+    )
+
+    results = []
+
+    for score, chain in chains:
+        steps = [
+            {
+                **scenes[position],
+                "query": query,
+                "score": round(float(scores[step, position]), 4),
+            }
+            for step, (query, position) in enumerate(zip(queries, chain))
+        ]
+
+        first = steps[0]
+
+        results.append({
+            "score": round(score, 4),
+            "timestamp": first["timestamp"],
+            "timestamp_label": first["timestamp_label"],
+            "youtube_url": first["youtube_url"],
+            "media_blob_url": first["media_blob_url"],
+            "source_type": first["source_type"],
+            "steps": steps,
+        })
+
+    return {
+        "queries": queries,
+        "max_gap_seconds": max_gap_seconds,
+        "count": len(results),
+        "results": results,
+    }
+
+
+async def gather_limited(coroutines, limit: int) -> list:
+    """
+    asyncio.gather with at most limit coroutines in flight.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+
+async def search_visual_scenes_backend_batch(
+    job_id: str,
+    namespace: str,
+    queries: List[str],
+    top_k: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Runs several visual queries against one job: every query is embedded
+    in a single CLIP forward pass and the vector store lookups run
+    concurrently, at most PINECONE_QUERY_CONCURRENCY at a time.
+    Returns one result group per query, in query order.
+    """
+
+    query_vectors = await embed_text_queries(queries)
+
+    if not query_vectors:
+        return []
+
+    grouped_results = await gather_limited(
+        (
+            query_visual_scenes(
+                job_id=job_id,
+                namespace=namespace,
+                query_vector=query_vector,
+                top_k=top_k,
+            )
+            for query_vector in query_vectors
+        ),
+        settings.PINECONE_QUERY_CONCURRENCY,
+    )
+
+    return [
+        {
+            "query": query,
+            "count": len(results),
+            "results": results,
+        }
+        for query, results in zip(queries, grouped_results)
+    ]
+
+
+async def search_visual_library(
+    jobs: List[Dict[str, Any]],
+    query: str,
+    max_results: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Runs one text query against many video jobs.
+
+    The query is embedded once. Each job is searched for its own top
+    max_results (from its scene snapshot or its vector store namespace),
+    with at most LIBRARY_VISUAL_SEARCH_CONCURRENCY jobs in flight, and the
+    per-job lists, already sorted, are heap-merged into the overall top
+    max_results. A job that fails is skipped rather than failing the search.
+    """
+
+    if not query.strip() or not jobs:
+        return []
+
+    query_vector = await embed_text_query(query)
+
+    async def search_job(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            results = await query_visual_scenes(
+                job_id=job["id"],
+                namespace=job["pinecone_namespace"],
+                query_vector=query_vector,
+                top_k=max_results,
+            )
+        except Exception as error:
+            print(f"[Library visual search] Skipping job {job['id']}: {error}")
+            return []
+
+        for result in results:
+            result["job_id"] = job["id"]
+            result["video_title"] = job.get("video_title") or job.get("original_file_name")
+
+        return results
+
+    job_results = await gather_limited(
+        (search_job(job) for job in jobs),
+        settings.LIBRARY_VISUAL_SEARCH_CONCURRENCY,
+    )
+
+    merged = heapq.merge(
+        *job_results,
+        key=lambda result: float(result.get("score") or 0),
+        reverse=True,
+    )
+
+    return list(islice(merged, max_results))
@@ -0,0 +1,87 @@
+import heapq
+from typing import List, Tuple
+
+import numpy as np
+
+
+def find_best_sequences(
+    scores: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    max_gap_seconds: float,
+    top_k: int,
+) -> List[Tuple[float, List[int]]]:
+    """
+    Finds the best time-ordered scene chains for a sequence of sub-queries.
+
+    scores is [steps, scenes], with scenes sorted by start time; -inf
+    marks a scene that cannot be used for a step. A chain picks one scene
+    per step, each strictly later than the previous one and starting at
+    most max_gap_seconds after the previous one ends, and is scored by the
+    mean of its step scores.
+
+    Each step is one dynamic programming pass: the best chain ending at
+    scene j is scores[step, j] plus the best previous-step chain among the
+    earlier scenes that end no more than max_gap_seconds before j starts.
+    Starts are sorted, so once a scene ends too early for j it ends too
+    early for every later scene as well. A max-heap of the earlier scenes
+    therefore only needs its top checked against the actual end and
+    dropped when too early, which stays exact when scenes overlap and
+    makes every pass O(n log n) in the scene count.
+
+    Returns up to top_k (mean score, scene positions) pairs, best first,
+    each ending at a different scene.
+    """
+
+    steps, scene_count = scores.shape
+
+    if steps == 0 or scene_count == 0:
+        return []
+
+    best = scores[0].astype("float64")
+    backpointers: List[np.ndarray] = []
+
+    for step in range(1, steps):
+        step_best = np.full(scene_count, -np.inf)
+        step_back = np.full(scene_count, -1, dtype="int64")
+
+        # (-chain score, scene) of the earlier scenes still in reach.
+        candidates: list = []
+
+        for scene in range(scene_count):
+            previous = scene - 1
+
+            if previous >= 0 and np.isfinite(best[previous]):
+                heapq.heappush(candidates, (-best[previous], previous))
+
+            while candidates and starts[scene] - ends[candidates[0][1]] > max_gap_seconds:
+                heapq.heappop(candidates)
+
+            if candidates and np.isfinite(scores[step, scene]):
+                step_best[scene] = -candidates[0][0] + scores[step, scene]
+                step_back[scene] = candidates[0][1]
+
+        best = step_best
+        backpointers.append(step_back)
+
+    finite = np.flatnonzero(np.isfinite(best))
+
+    if finite.size == 0:
+        return []
+
+    k = min(top_k, finite.size)
+    top = finite[np.argpartition(-best[finite], k - 1)[:k]]
+    top = top[np.argsort(-best[top], kind="stable")]
+
+    sequences = []
+
+    for end_scene in top:
+        chain = [int(end_scene)]
+
+        for step_back in reversed(backpointers):
+            chain.append(int(step_back[chain[-1]]))
+
+        chain.reverse()
+        sequences.append((float(best[end_scene]) / steps, chain))
+
+    return sequences
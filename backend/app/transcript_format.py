@@ -0,0 +1,266 @@
+import json
+import struct
+import zlib
+from collections.abc import Sequence
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+# Binary transcript layout (little-endian), stored as <job_id>.transcript.bin
+# next to the JSON transcript:
+#
+#   magic              4s   b"MTRN"
+#   version            u16
+#   flags              u16  FLAG_ZLIB: everything below is zlib-compressed
+#   metadata_length    u32
+#   segment_count      u32
+#   word_count         u32  (version 2+)
+#   metadata           UTF-8 JSON of every transcript field except segments
+#                      and words, zero-padded to a multiple of 4 bytes
+#   index              int32[n]    Whisper segment ids
+#   start              float32[n]  seconds
+#   end                float32[n]  seconds
+#   text_offsets       uint32[n+1] byte offsets into text
+#   word_start         float32[w]  seconds (version 2+)
+#   word_end           float32[w]  seconds (version 2+)
+#   word_text_offsets  uint32[w+1] byte offsets into word_text (version 2+)
+#   text               UTF-8 bytes of all segment texts, back to back
+#   word_text          UTF-8 bytes of all word texts, back to back (version 2+)
+#
+# The columns are read with np.frombuffer over the body, and a segment
+# dict is only built when it is read. Only an uncompressed transcript
+# (compress=False) is read in place, so it can be decoded straight from an
+# mmap without copying. The blobs the audio worker uploads are compressed;
+# decoding those copies the decompressed body once, and nothing maps them.
+
+TRANSCRIPT_MAGIC = b"MTRN"
+TRANSCRIPT_FORMAT_VERSION = 2
+
+FLAG_ZLIB = 1
+
+PREAMBLE = struct.Struct("<4sHH")
+BODY_HEADER_V1 = struct.Struct("<II")
+BODY_HEADER = struct.Struct("<III")
+
+
+def pad_to_4(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def pack_strings(values: List[str]) -> tuple[bytes, bytes]:
+    encoded = [value.encode("utf-8") for value in values]
+
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+
+    return offsets.tobytes(), b"".join(encoded)
+
+
+def encode_binary_transcript(
+    transcript_data: Dict[str, Any],
+    compress: bool = True,
+) -> bytes:
+    segments: List[Dict[str, Any]] = transcript_data.get("segments", [])
+    words: Dict[str, List[Any]] = transcript_data.get("words") or {}
+
+    metadata = {
+        key: value
+        for key, value in transcript_data.items()
+        if key not in {"segments", "words"}
+    }
+    metadata_bytes = pad_to_4(
+        json.dumps(metadata, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+    text_offsets, text = pack_strings(
+        [segment.get("text", "") for segment in segments]
+    )
+
+    word_starts = words.get("start", [])
+    word_text_offsets, word_text = pack_strings(
+        [word or "" for word in words.get("text", [])]
+    )
+
+    body = b"".join([
+        BODY_HEADER.pack(len(metadata_bytes), len(segments), len(word_starts)),
+        metadata_bytes,
+        np.array([segment.get("index", position) for position, segment in enumerate(segments)], dtype="<i4").tobytes(),
+        np.array([segment.get("start", 0) for segment in segments], dtype="<f4").tobytes(),
+        np.array([segment.get("end", 0) for segment in segments], dtype="<f4").tobytes(),
+        text_offsets,
+        np.array(word_starts, dtype="<f4").tobytes(),
+        np.array(words.get("end", []), dtype="<f4").tobytes(),
+        word_text_offsets,
+        text,
+        word_text,
+    ])
+
+    flags = 0
+
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+
+    return PREAMBLE.pack(TRANSCRIPT_MAGIC, TRANSCRIPT_FORMAT_VERSION, flags) + body
+
+
+class PackedStrings(Sequence):
+    """
+    Read-only list of strings stored as one UTF-8 buffer plus offsets.
+    """
+
+    def __init__(self, offsets: np.ndarray, buffer: memoryview):
+        self.offsets = offsets
+        self.buffer = buffer
+
+    def __len__(self) -> int:
+        return int(self.offsets.shape[0]) - 1
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[item] for item in range(*position.indices(len(self)))]
+
+        if position < 0:
+            position += len(self)
+
+        if not 0 <= position < len(self):
+            raise IndexError("string position out of range")
+
+        start = int(self.offsets[position])
+        end = int(self.offsets[position + 1])
+
+        return bytes(self.buffer[start:end]).decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + len(self.buffer)
+
+
+class BinarySegments(Sequence):
+    """
+    Read-only list of segment dicts backed by the binary transcript columns.
+    """
+
+    def __init__(
+        self,
+        index: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        texts: PackedStrings,
+    ):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.texts = texts
+
+    def __len__(self) -> int:
+        return int(self.index.shape[0])
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[item] for item in range(*position.indices(len(self)))]
+
+        if position < 0:
+            position += len(self)
+
+        if not 0 <= position < len(self):
+            raise IndexError("segment position out of range")
+
+        return {
+            "index": int(self.index[position]),
+            "start": float(self.start[position]),
+            "end": float(self.end[position]),
+            "text": self.texts[position],
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.index.nbytes
+            + self.start.nbytes
+            + self.end.nbytes
+            + self.texts.nbytes
+        )
+
+
+def binary_transcript_nbytes(transcript_data: Dict[str, Any]) -> int:
+    words = transcript_data.get("words") or {}
+
+    return transcript_data["segments"].nbytes + sum(
+        words[key].nbytes for key in ("start", "end", "text") if key in words
+    )
+
+
+def decode_binary_transcript(data) -> Dict[str, Any]:
+    """
+    Decodes a binary transcript from bytes, or any buffer such as an mmap
+    (read in place only when uncompressed), into the same shape as the
+    JSON transcript. "segments" is a
+    BinarySegments view over the columns instead of a list of dicts, and
+    "words" (version 2+) holds start/end arrays and a PackedStrings of texts.
+    """
+
+    magic, version, flags = PREAMBLE.unpack_from(data, 0)
+
+    if magic != TRANSCRIPT_MAGIC:
+        raise ValueError("Not a binary transcript.")
+
+    if version not in {1, 2}:
+        raise ValueError(f"Unsupported binary transcript version: {version}")
+
+    body = memoryview(data)[PREAMBLE.size:]
+
+    if flags & FLAG_ZLIB:
+        body = memoryview(zlib.decompress(body))
+
+    if version == 1:
+        metadata_length, segment_count = BODY_HEADER_V1.unpack_from(body, 0)
+        word_count = 0
+        offset = BODY_HEADER_V1.size
+    else:
+        metadata_length, segment_count, word_count = BODY_HEADER.unpack_from(body, 0)
+        offset = BODY_HEADER.size
+
+    metadata = json.loads(bytes(body[offset:offset + metadata_length]).rstrip(b"\0"))
+    offset += metadata_length
+
+    def column(dtype: str, count: int) -> np.ndarray:
+        nonlocal offset
+        values = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+        offset += values.nbytes
+        return values
+
+    def strings(offsets: np.ndarray) -> PackedStrings:
+        nonlocal offset
+        size = int(offsets[-1])
+        values = PackedStrings(offsets, body[offset:offset + size])
+        offset += size
+        return values
+
+    index = column("<i4", segment_count)
+    start = column("<f4", segment_count)
+    end = column("<f4", segment_count)
+    text_offsets = column("<u4", segment_count + 1)
+
+    transcript_data = dict(metadata)
+
+    if version == 1:
+        texts = strings(text_offsets)
+    else:
+        word_start = column("<f4", word_count)
+        word_end = column("<f4", word_count)
+        word_text_offsets = column("<u4", word_count + 1)
+
+        texts = strings(text_offsets)
+
+        if word_count:
+            transcript_data["words"] = {
+                "start": word_start,
+                "end": word_end,
+                "text": strings(word_text_offsets),
+            }
+
+    transcript_data["segments"] = BinarySegments(index, start, end, texts)
+
+    return transcript_data
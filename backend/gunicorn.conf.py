@@ -0,0 +1,38 @@
+import gc
+import os
+
+
+# Preload-then-fork serving:
+#
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# The master imports the app and loads the CLIP weights once, then forks
+# WEB_CONCURRENCY uvicorn workers. The workers share the weight pages
+# copy-on-write instead of each loading their own copy, so request
+# concurrency scales across cores without multiplying model memory.
+#
+# Clients (Supabase, Azure, Pinecone), thread pools and the CLIP warmup
+# pass are still created per worker, after the fork, by the app lifespan.
+
+bind = f"0.0.0.0:{os.getenv('PORT', '7860')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Model loading and the per-worker warmup are slow on small CPUs.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def when_ready(server):
+    from app.search.visual_search import preload_clip_weights
+
+    try:
+        preload_clip_weights()
+    except Exception as error:
+        # Workers load the model themselves on first use instead.
+        print(f"[Preload] CLIP preload failed: {error}")
+
+    # Move everything allocated so far out of the collector's reach, so
+    # garbage collection in the workers does not write to, and so copy,
+    # the shared pages.
+    gc.freeze()
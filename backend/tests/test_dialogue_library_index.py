@@ -0,0 +1,72 @@
+import random
+
+from app.search.dialogue_index import build_dialogue_index, merge_dialogue_indexes
+from app.search.dialogue_search import find_match_time, rank_segments
+
+
+WORDS = ["force", "strong", "luke", "father", "dark", "side", "ship", "run", "hello", "there"]
+
+
+def random_segments(rng, count):
+    return [
+        {
+            "start": float(position),
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6))),
+        }
+        for position in range(count)
+    ]
+
+
+def exact_matches(index, query):
+    return {
+        (match["segment"], match["match_type"], round(match["score"], 9))
+        for match in rank_segments(index, query, max_results=1000)
+        if match["match_type"] != "keywords"
+    }
+
+
+def test_phrase_and_proximity_matches_are_those_of_each_transcript():
+    rng = random.Random(5)
+
+    for _ in range(50):
+        transcripts = [random_segments(rng, rng.randint(0, 8)) for _ in range(rng.randint(1, 5))]
+        indexes = [build_dialogue_index(segments) for segments in transcripts]
+        merged = merge_dialogue_indexes(indexes)
+        document_segment_offsets = merged["document_segment_offsets"]
+
+        for query in ["force strong", "luke father", "dark side ship", "hello"]:
+            expected = set()
+
+            for slot, index in enumerate(indexes):
+                expected |= {
+                    (segment + document_segment_offsets[slot], match_type, score)
+                    for segment, match_type, score in exact_matches(index, query)
+                }
+
+            assert exact_matches(merged, query) == expected
+
+
+def test_phrase_does_not_span_two_transcripts():
+    merged = merge_dialogue_indexes([
+        build_dialogue_index([{"start": 0.0, "text": "may the force"}]),
+        build_dialogue_index([{"start": 0.0, "text": "be with you"}]),
+    ])
+
+    assert rank_segments(merged, '"force be with you"', max_results=10) == []
+
+
+def test_token_times_are_kept_per_transcript():
+    timed = build_dialogue_index(
+        [{"start": 0.0, "text": "hello there"}],
+        {"text": ["hello", "there"], "start": [0.5, 1.25]},
+    )
+    untimed = build_dialogue_index([{"start": 0.0, "text": "hello there"}])
+    merged = merge_dialogue_indexes([untimed, timed])
+
+    matches = {
+        match["segment"]: match
+        for match in rank_segments(merged, '"hello there"', max_results=10)
+    }
+
+    assert find_match_time(merged, 0, matches[0]["matched_positions"]) is None
+    assert find_match_time(merged, 1, matches[1]["matched_positions"]) == 0.5
@@ -0,0 +1,97 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.search.visual_sequence import find_best_sequences
+
+
+def brute_force_best(scores, starts, ends, max_gap_seconds):
+    steps, scene_count = scores.shape
+    best = -np.inf
+
+    for chain in itertools.product(range(scene_count), repeat=steps):
+        linked = all(
+            chain[i] < chain[i + 1] and starts[chain[i + 1]] - ends[chain[i]] <= max_gap_seconds
+            for i in range(steps - 1)
+        )
+
+        if not linked:
+            continue
+
+        total = sum(scores[step, scene] for step, scene in enumerate(chain))
+
+        if np.isfinite(total):
+            best = max(best, total / steps)
+
+    return best
+
+
+def random_scenes(rng, scene_count, overlapping):
+    if overlapping:
+        starts = np.sort(rng.uniform(0, 30, size=scene_count))
+        ends = starts + rng.uniform(0.5, 20, size=scene_count)
+    else:
+        durations = rng.uniform(1, 10, size=scene_count)
+        starts = np.concatenate([[0.0], np.cumsum(durations)[:-1]])
+        ends = starts + durations
+
+    return starts, ends
+
+
+def assert_matches_brute_force(scores, starts, ends, max_gap_seconds):
+    results = find_best_sequences(scores, starts, ends, max_gap_seconds, top_k=3)
+    expected = brute_force_best(scores, starts, ends, max_gap_seconds)
+
+    if not np.isfinite(expected):
+        assert results == []
+        return
+
+    assert results[0][0] == pytest.approx(expected)
+
+    for mean_score, chain in results:
+        assert len(chain) == scores.shape[0]
+        assert mean_score == pytest.approx(
+            sum(scores[step, scene] for step, scene in enumerate(chain)) / scores.shape[0]
+        )
+
+        for previous, scene in zip(chain, chain[1:]):
+            assert previous < scene
+            assert starts[scene] - ends[previous] <= max_gap_seconds
+
+
+@pytest.mark.parametrize("overlapping", [False, True])
+def test_matches_brute_force_on_random_scenes(overlapping):
+    rng = np.random.default_rng(7)
+
+    for _ in range(300):
+        scene_count = int(rng.integers(1, 10))
+        steps = int(rng.integers(1, 4))
+
+        starts, ends = random_scenes(rng, scene_count, overlapping)
+        scores = rng.uniform(-1, 1, size=(steps, scene_count))
+        scores[rng.uniform(size=scores.shape) < 0.2] = -np.inf
+
+        assert_matches_brute_force(scores, starts, ends, rng.uniform(0, 15))
+
+
+def test_long_earlier_scene_does_not_extend_a_shorter_ones_reach():
+    # Scene 0 runs past scene 1, but scene 1 itself ends long before
+    # scene 2 starts, so 1 -> 2 must not be linked.
+    starts = np.array([0.0, 1.0, 30.0])
+    ends = np.array([29.0, 2.0, 31.0])
+    scores = np.array([
+        [0.1, 0.9, -np.inf],
+        [-np.inf, -np.inf, 0.9],
+    ])
+
+    results = find_best_sequences(scores, starts, ends, max_gap_seconds=5.0, top_k=3)
+
+    assert results[0][1] == [0, 2]
+    assert results[0][0] == pytest.approx(0.5)
+    assert_matches_brute_force(scores, starts, ends, 5.0)
+
+
+def test_empty_inputs():
+    assert find_best_sequences(np.zeros((0, 3)), np.zeros(3), np.ones(3), 1.0, 3) == []
+    assert find_best_sequences(np.zeros((2, 0)), np.zeros(0), np.zeros(0), 1.0, 3) == []
@@ -34,6 +34,9 @@ const SEARCH_MODES = [
 
 const MAX_UPLOAD_SIZE_BYTES = 2 * 1024 * 1024 * 1024;
 
+// Failed reconnects in a row before job progress falls back to polling.
+const MAX_JOB_EVENT_RECONNECTS = 3;
+
 function cx(...classes) {
   return classes.filter(Boolean).join(" ");
 }
@@ -222,6 +225,7 @@ export default function App() {
   const [appReady, setAppReady] = useState(false);
 
   const pollRef = useRef(null);
+  const jobEventsRef = useRef(null);
   const modePickerRef = useRef(null);
   const uploadModeRowRef = useRef(null);
   const youtubeInputRef = useRef(null);
@@ -378,6 +382,11 @@ export default function App() {
       clearInterval(pollRef.current);
       pollRef.current = null;
     }
+
+    if (jobEventsRef.current) {
+      jobEventsRef.current.close();
+      jobEventsRef.current = null;
+    }
   };
 
   const scrollToResults = () => {
@@ -392,47 +401,49 @@ export default function App() {
   const pollJob = (id, source = sourceType) => {
   stopPolling();
 
-  const fetchJob = async () => {
-    try {
-      const endpoint =
-        source === "upload"
-          ? `${API}/upload/jobs/${id}`
-          : `${API}/youtube/jobs/${id}`;
-
-      const response = await axios.get(endpoint);
-      const latestJob = response.data;
-
-      setJob(latestJob);
-
-      if (latestJob.status === "ready" || latestJob.status === "failed") {
-        stopPolling();
-
-        setProcessingStartTime((startedAt) => {
-          if (startedAt) {
-            const duration = Date.now() - startedAt;
-            setProcessingDuration(duration);
-
-            if (latestJob.status === "ready") {
-              setTimeout(() => {
-                querySectionRef.current?.scrollIntoView({
-                  behavior: "smooth",
-                  block: "center",
-                });
-              }, 300);
-
-              setCurrentVerbose(
-                `Task completed in ${formatDuration(duration)}. You can now search this ${source === "upload" ? "file" : "video"}.`
-              );
-            } else {
-              setCurrentVerbose(
-                `Task stopped after ${formatDuration(duration)} because processing failed.`
-              );
-            }
+  const jobUrl =
+    source === "upload"
+      ? `${API}/upload/jobs/${id}`
+      : `${API}/youtube/jobs/${id}`;
+
+  const handleJobUpdate = (latestJob) => {
+    setJob(latestJob);
+
+    if (latestJob.status === "ready" || latestJob.status === "failed") {
+      stopPolling();
+
+      setProcessingStartTime((startedAt) => {
+        if (startedAt) {
+          const duration = Date.now() - startedAt;
+          setProcessingDuration(duration);
+
+          if (latestJob.status === "ready") {
+            setTimeout(() => {
+              querySectionRef.current?.scrollIntoView({
+                behavior: "smooth",
+                block: "center",
+              });
+            }, 300);
+
+            setCurrentVerbose(
+              `Task completed in ${formatDuration(duration)}. You can now search this ${source === "upload" ? "file" : "video"}.`
+            );
+          } else {
+            setCurrentVerbose(
+              `Task stopped after ${formatDuration(duration)} because processing failed.`
+            );
           }
+        }
 
-          return startedAt;
-        });
-      }
+        return startedAt;
+      });
+    }
+  };
+
+  const fetchJob = async () => {
+    try {
+      const response = await axios.get(jobUrl);
+      handleJobUpdate(response.data);
     } catch (err) {
       stopPolling();
       setError(
@@ -451,8 +462,50 @@ export default function App() {
     }
   };
 
-  fetchJob();
-  pollRef.current = setInterval(fetchJob, 2400);
+  const startFallbackPolling = () => {
+    stopPolling();
+    fetchJob();
+    pollRef.current = setInterval(fetchJob, 2400);
+  };
+
+  if (typeof EventSource === "undefined") {
+    startFallbackPolling();
+    return;
+  }
+
+  // The backend pushes the job whenever it changes and closes the stream
+  // once it is ready or failed. A dropped stream (proxy idle timeout,
+  // deploy) reconnects on its own and gets the current job first. Only
+  // when the browser gives up, or reconnecting keeps failing, fall back
+  // to polling.
+  const events = new EventSource(`${jobUrl}/events`);
+  jobEventsRef.current = events;
+
+  let failedReconnects = 0;
+
+  events.onopen = () => {
+    failedReconnects = 0;
+  };
+
+  events.onmessage = (event) => {
+    failedReconnects = 0;
+    handleJobUpdate(JSON.parse(event.data));
+  };
+
+  events.onerror = () => {
+    if (jobEventsRef.current !== events) {
+      return;
+    }
+
+    failedReconnects += 1;
+
+    if (
+      events.readyState === EventSource.CLOSED ||
+      failedReconnects >= MAX_JOB_EVENT_RECONNECTS
+    ) {
+      startFallbackPolling();
+    }
+  };
 };
 
   const startProcessing = async () => {